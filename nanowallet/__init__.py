@@ -1,48 +1,49 @@
 # nanowallet/__init__.py
-from .wallets import (
-    NanoWalletReadOnly,
-    NanoWalletKey,
-    NanoWallet,
-)
-from .models import WalletConfig, WalletBalance, AccountInfo
-from .utils import NanoResult
-from .errors import (
-    RpcError,
-    InvalidSeedError,
-    InvalidIndexError,
-    BlockNotFoundError,
-    InvalidAccountError,
-    InsufficientBalanceError,
-    TimeoutException,
-)
-from .utils.conversion import raw_to_nano, nano_to_raw
-from .utils.amount_operations import sum_received_amount
-from .utils.validation import validate_nano_amount, validate_account
-from .libs.rpc import NanoWalletRpc
+# Public names are resolved lazily (PEP 562) so that importing a light helper
+# such as raw_to_nano does not load the wallet and RPC stack.
+import importlib
+import logging
 
-__all__ = [
+# Library logging stays silent unless the application configures handlers
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+_LAZY = {
     # Wallet classes
-    "NanoWalletReadOnly",
-    "NanoWalletKey",
-    "NanoWallet",
-    "NanoWalletRpc",
+    "NanoWalletReadOnly": "nanowallet.wallets",
+    "NanoWalletKey": "nanowallet.wallets",
+    "NanoWallet": "nanowallet.wallets",
+    "NanoWalletRpc": "nanowallet.libs.rpc",
     # Models
-    "WalletConfig",
-    "WalletBalance",
-    "AccountInfo",
-    "NanoResult",
+    "WalletConfig": "nanowallet.models",
+    "WalletBalance": "nanowallet.models",
+    "AccountInfo": "nanowallet.models",
+    "NanoResult": "nanowallet.utils",
     # Errors
-    "RpcError",
-    "InvalidSeedError",
-    "InvalidIndexError",
-    "BlockNotFoundError",
-    "InvalidAccountError",
-    "InsufficientBalanceError",
-    "TimeoutException",
+    "RpcError": "nanowallet.errors",
+    "InvalidSeedError": "nanowallet.errors",
+    "InvalidIndexError": "nanowallet.errors",
+    "BlockNotFoundError": "nanowallet.errors",
+    "InvalidAccountError": "nanowallet.errors",
+    "InsufficientBalanceError": "nanowallet.errors",
+    "TimeoutException": "nanowallet.errors",
     # Utils
-    "raw_to_nano",
-    "nano_to_raw",
-    "validate_nano_amount",
-    "validate_account",
-    "sum_received_amount",
-]
+    "raw_to_nano": "nanowallet.utils.conversion",
+    "nano_to_raw": "nanowallet.utils.conversion",
+    "validate_nano_amount": "nanowallet.utils.validation",
+    "validate_account": "nanowallet.utils.validation",
+    "sum_received_amount": "nanowallet.utils.amount_operations",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Type
 
 import logging
 
@@ -72,7 +72,8 @@ class InvalidIndexError(NanoException):
 
 
 #
-# Utility functions for interpreting RPC responses
+# Utility functions for interpreting RPC responses. Kept for backwards
+# compatibility; none of them call into another helper.
 #
 
 
@@ -83,12 +84,12 @@ def has_error(response: Dict[str, Any]) -> bool:
 
 def get_error(response: Dict[str, Any]) -> Optional[str]:
     """Get error message from response if present."""
-    return response["error"] if has_error(response) else None
+    return response["error"] if "error" in response else None
 
 
 def no_error(response: Dict[str, Any]) -> bool:
     """Check if response contains no error."""
-    return not has_error(response)
+    return "error" not in response
 
 
 def zero_balance(response: Dict[str, Any]) -> bool:
@@ -98,29 +99,31 @@ def zero_balance(response: Dict[str, Any]) -> bool:
 
 def account_not_found(response: Dict[str, Any]) -> bool:
     """Check if response indicates account not found error."""
-    error_msg = get_error(response)
-    return error_msg == "Account not found"
+    return "error" in response and response["error"] == "Account not found"
 
 
 def block_not_found(response: Dict[str, Any]) -> bool:
     """Check if response indicates block not found error."""
-    error_msg = get_error(response)
-    return error_msg == "Block not found"
+    return "error" in response and response["error"] == "Block not found"
+
+
+# Maps known RPC error messages to the exception raised for them. None marks
+# errors that callers interpret themselves (an unopened account is valid state).
+_ERROR_TYPES: Dict[str, Optional[Type[NanoException]]] = {
+    "Account not found": None,
+    "Block not found": BlockNotFoundError,
+}
 
 
 def try_raise_error(response: Dict[str, Any]):
     """
     Raise a NanoException if response contains an error.
-    Tries to pick a more specific exception type based on the error message.
+    Picks a more specific exception type based on the error message.
     """
-    if has_error(response):
-        error_msg = get_error(response) or "Unknown error"
-        full_msg = f"{error_msg}"
-
-        if account_not_found(response):
-            pass
-            # raise InvalidAccountError(full_msg)
-        elif block_not_found(response):
-            raise BlockNotFoundError(full_msg)
-        else:
-            raise RpcError(full_msg)
+    if "error" not in response:
+        return
+
+    error_msg = response["error"] or "Unknown error"
+    error_type = _ERROR_TYPES.get(error_msg, RpcError)
+    if error_type is not None:
+        raise error_type(error_msg)
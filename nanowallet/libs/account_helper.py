@@ -1,10 +1,42 @@
+from functools import lru_cache
+import re
+from ed25519_blake2b import SigningKey
 from nano_lib_py.accounts import (
-    validate_account_id,
     get_account_public_key,
     generate_account_private_key,
     get_account_id,
+    validate_private_key,
     AccountIDPrefix,
 )
+from nano_lib_py.exceptions import InvalidAccount
+
+# Shape of an account ID: prefix, first digit 1 or 3 and 59 nbase32 characters
+_ACCOUNT_ID_RE = re.compile(r"(?:nano|xrb)_[13][13456789abcdefghijkmnopqrstuwxyz]{59}")
+
+
+# Key derivations are pure functions of their input, so results are memoized.
+# The address and signing key caches are keyed by private key, which keeps
+# key material in memory; call AccountHelper.cache_clear() to drop it.
+@lru_cache(maxsize=4096)
+def _cached_public_key(account_id: str) -> str:
+    return get_account_public_key(account_id=account_id)
+
+
+@lru_cache(maxsize=4096)
+def _cached_account_id(public_key: str) -> str:
+    return get_account_id(public_key=public_key, prefix=AccountIDPrefix.NANO)
+
+
+@lru_cache(maxsize=64)
+def _cached_account_address(private_key: str) -> str:
+    return get_account_id(private_key=private_key)
+
+
+@lru_cache(maxsize=64)
+def _cached_signing_key(private_key: str) -> SigningKey:
+    # Expand a private key once and reuse the signing key for later blocks
+    validate_private_key(private_key)
+    return SigningKey(bytes.fromhex(private_key))
 
 
 class AccountHelper:
@@ -13,17 +45,28 @@ class AccountHelper:
     @staticmethod
     def validate_account(account_id: str) -> bool:
         """Validate a Nano account ID"""
-        return validate_account_id(account_id)
+        # Malformed IDs are rejected by the precompiled pattern without
+        # decoding. Otherwise validation decodes the public key, so reuse the
+        # memoized lookup; bad checksums are not cached and raise every call.
+        if isinstance(account_id, str) and not _ACCOUNT_ID_RE.fullmatch(account_id):
+            raise InvalidAccount("Invalid NANO address")
+        _cached_public_key(account_id)
+        return account_id
 
     @staticmethod
     def get_account_address(private_key: str) -> str:
         """Get account ID from private key"""
-        return get_account_id(private_key=private_key)
+        return _cached_account_address(private_key)
+
+    @staticmethod
+    def get_signing_key(private_key: str) -> SigningKey:
+        """Get the ed25519 signing key of a private key"""
+        return _cached_signing_key(private_key)
 
     @staticmethod
     def get_public_key(account_id: str) -> str:
         """Get public key from account ID"""
-        return get_account_public_key(account_id=account_id)
+        return _cached_public_key(account_id)
 
     @staticmethod
     def generate_private_key(seed: str, index: int) -> str:
@@ -33,8 +76,19 @@ class AccountHelper:
     @staticmethod
     def get_account(*, public_key=None, private_key=None) -> str:
         """Get account ID from public key"""
+        if public_key is not None and private_key is None:
+            # Encoding is repeated for every history entry with the same link
+            return _cached_account_id(public_key)
         return get_account_id(
             public_key=public_key,
             private_key=private_key,
             prefix=AccountIDPrefix.NANO,
         )
+
+    @staticmethod
+    def cache_clear() -> None:
+        """Drop all memoized key derivations"""
+        _cached_public_key.cache_clear()
+        _cached_account_id.cache_clear()
+        _cached_account_address.cache_clear()
+        _cached_signing_key.cache_clear()
@@ -1,7 +1,57 @@
+from functools import cached_property
+from hashlib import blake2b
 from nano_lib_py.blocks import Block
-from typing import Optional
+from typing import Iterable, List, Optional
 from nanowallet.libs.account_helper import AccountHelper
 
+ZERO_HASH = "0" * 64
+STATE_BLOCK_PREAMBLE = bytes(31) + b"\x06"
+
+
+def state_block_hash(
+    account_public_key: str,
+    previous: str,
+    representative_public_key: str,
+    balance: int,
+    link: str,
+) -> str:
+    """Hash the state block preimage from hex public keys and hashes"""
+    preimage = b"".join(
+        (
+            STATE_BLOCK_PREAMBLE,
+            bytes.fromhex(account_public_key),
+            bytes.fromhex(previous),
+            bytes.fromhex(representative_public_key),
+            balance.to_bytes(16, "big"),
+            bytes.fromhex(link),
+        )
+    )
+    return blake2b(preimage, digest_size=32).hexdigest().upper()
+
+
+def work_hash(account: str, previous: Optional[str]) -> str:
+    """
+    Return the hash proof of work is generated for.
+
+    It only depends on the previous block, or on the account public key for
+    open blocks, so work can be requested before the block is built.
+    """
+    if previous and previous.strip("0"):
+        return previous
+    return AccountHelper.get_public_key(account)
+
+
+def sign_hash(private_key: str, block_hash: str) -> str:
+    """Sign a block hash and return the signature as hex string"""
+    signing_key = AccountHelper.get_signing_key(private_key)
+    return signing_key.sign(msg=bytes.fromhex(block_hash)).hex()
+
+
+def sign_hashes(private_key: str, block_hashes: Iterable[str]) -> List[str]:
+    """Sign several block hashes with the same private key"""
+    sign = AccountHelper.get_signing_key(private_key).sign
+    return [sign(msg=bytes.fromhex(block_hash)).hex() for block_hash in block_hashes]
+
 
 class NanoWalletBlock:
     """Encapsulates block creation and manipulation"""
@@ -28,32 +78,65 @@ class NanoWalletBlock:
             link=self._get_link_value(source_hash, destination_account),
         )
 
+    @staticmethod
     def _get_link_value(
-        self, source_hash: Optional[str], destination_account: Optional[str]
+        source_hash: Optional[str], destination_account: Optional[str]
     ) -> str:
-        """Get the link value for the block based on source hash or destination account"""
+        """
+        Get the link value for the block based on source hash or destination account.
+
+        Destination public keys come from the memoized AccountHelper lookup, so
+        repeated sends to the same account skip the base32/checksum decoding.
+        """
         if destination_account:
             return AccountHelper.get_public_key(destination_account)
-        return source_hash or "0" * 64
+        return source_hash or ZERO_HASH
 
     def sign(self, private_key: str) -> None:
         """Sign the block with provided private key"""
-        self._block.sign(private_key)
+        if self._block.signature:
+            raise ValueError("The block already has a signature.")
+        self._block.signature = sign_hash(private_key, self.block_hash)
 
-    @property
+    @staticmethod
+    def sign_all(blocks: List["NanoWalletBlock"], private_key: str) -> None:
+        """Sign several blocks of the same account in one pass"""
+        if any(block._block.signature for block in blocks):
+            raise ValueError("The block already has a signature.")
+        signatures = sign_hashes(private_key, [block.block_hash for block in blocks])
+        for block, signature in zip(blocks, signatures):
+            block._block.signature = signature
+
+    # The hashes only depend on the fields set in __init__ (signature and work
+    # are not part of them), so each is computed once per block. Public keys
+    # come from the memoized AccountHelper lookup instead of being decoded
+    # from the account addresses on every hash.
+    @cached_property
     def work_block_hash(self) -> str:
         """Get the work block hash for work generation"""
-        return self._block.work_block_hash
+        return work_hash(self._block.account, self._block.previous)
 
-    @property
+    @cached_property
     def block_hash(self) -> str:
         """Get the block hash"""
-        return self._block.block_hash
+        block = self._block
+        return state_block_hash(
+            AccountHelper.get_public_key(block.account),
+            block.previous or ZERO_HASH,
+            AccountHelper.get_public_key(block.representative),
+            block.balance,
+            block.link,
+        )
 
     def set_work(self, work: str) -> None:
         """Set the work value on the block"""
         self._block.work = work
 
     def json(self) -> dict:
-        """Get the block as a JSON-compatible dictionary"""
-        return self._block.json()
+        """
+        Get the block as a JSON-compatible dictionary.
+
+        The dictionary is sent as is with json_block, instead of being
+        encoded to a string first and embedded in the request as one.
+        """
+        return self._block.to_dict()
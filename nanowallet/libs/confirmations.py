@@ -0,0 +1,161 @@
+from typing import Dict, Optional, Set
+import asyncio
+import logging
+
+from aiohttp import ClientSession, ClientWebSocketResponse, WSMsgType
+
+from .transport import _json_loads
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the node to acknowledge the subscription
+SUBSCRIBE_TIMEOUT = 5.0
+
+
+class ConfirmationListener:
+    """
+    Websocket subscription to the confirmations of one account.
+
+    The connection is opened when the first waiter enters the listener and
+    closed when the last one leaves, so concurrent confirmation waits (e.g.
+    all blocks of receive_all) share a single websocket.
+    """
+
+    def __init__(self, ws_url: str, account: str):
+        """
+        Initialize the listener. No connection is opened yet.
+
+        Args:
+            ws_url: Websocket URL of the node, e.g. ws://localhost:7078
+            account: Account whose confirmations are subscribed to
+        """
+        self.ws_url = ws_url
+        self.account = account
+        self._users = 0
+        self._lock = asyncio.Lock()
+        self._session: Optional[ClientSession] = None
+        self._ws: Optional[ClientWebSocketResponse] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._confirmed: Set[str] = set()
+
+    async def __aenter__(self) -> "ConfirmationListener":
+        async with self._lock:
+            if self._users == 0:
+                await self._open()
+            self._users += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._lock:
+            self._users -= 1
+            if self._users == 0:
+                await self._close()
+
+    async def _open(self) -> None:
+        """Connect and subscribe to the confirmation topic"""
+        self._session = ClientSession()
+        try:
+            self._ws = await self._session.ws_connect(self.ws_url)
+            await self._ws.send_json(
+                {
+                    "action": "subscribe",
+                    "topic": "confirmation",
+                    "ack": True,
+                    "options": {"accounts": [self.account]},
+                }
+            )
+            # Confirmations are only pushed once the node acknowledged
+            while True:
+                message = await self._ws.receive_json(timeout=SUBSCRIBE_TIMEOUT)
+                if isinstance(message, dict) and message.get("ack") == "subscribe":
+                    break
+        except asyncio.TimeoutError as e:
+            await self._close()
+            raise ConnectionError("Confirmation subscription not acknowledged") from e
+        except (TypeError, ValueError) as e:
+            # receive_json raises TypeError for close and error frames and
+            # ValueError for payloads that are not JSON
+            await self._close()
+            raise ConnectionError(
+                f"Confirmation subscription failed: {str(e) or type(e).__name__}"
+            ) from e
+        except BaseException:
+            await self._close()
+            raise
+        self._reader = asyncio.ensure_future(self._read())
+        logger.debug("Subscribed to confirmations of %s", self.account)
+
+    async def _close(self) -> None:
+        """Stop reading and close the websocket"""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):  # pylint: disable=broad-except
+                pass
+        if self._ws is not None:
+            await self._ws.close()
+        if self._session is not None:
+            await self._session.close()
+        self._reader = self._ws = self._session = None
+        self._confirmed.clear()
+
+    async def _read(self) -> None:
+        """Resolve waiters as confirmations arrive"""
+        try:
+            async for message in self._ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                block_hash = self._confirmed_hash(message.data)
+                if block_hash is None:
+                    continue
+                waiter = self._waiters.pop(block_hash, None)
+                if waiter is None:
+                    self._confirmed.add(block_hash)
+                elif not waiter.done():
+                    waiter.set_result(True)
+        finally:
+            # Waiters still pending will not be resolved by this connection
+            for waiter in self._waiters.values():
+                if not waiter.done():
+                    waiter.set_exception(
+                        ConnectionError("Confirmation websocket closed")
+                    )
+            self._waiters.clear()
+
+    @staticmethod
+    def _confirmed_hash(payload: str) -> Optional[str]:
+        """Return the block hash of a confirmation message, None for others"""
+        try:
+            data = _json_loads(payload)
+            if data.get("topic") != "confirmation":
+                return None
+            return data["message"]["hash"].upper()
+        except (AttributeError, KeyError, TypeError, ValueError):
+            logger.debug("Skipping malformed websocket message: %s", payload)
+            return None
+
+    async def wait(self, block_hash: str, timeout: float) -> None:
+        """
+        Wait until the block is confirmed.
+
+        Confirmations received since the subscription are remembered, so
+        a block confirmed before this call returns immediately.
+
+        :raises asyncio.TimeoutError: If not confirmed within timeout
+        :raises ConnectionError: If the websocket is closed
+        """
+        block_hash = block_hash.upper()
+        if block_hash in self._confirmed:
+            self._confirmed.discard(block_hash)
+            return
+        if self._reader is None or self._reader.done():
+            raise ConnectionError("Confirmation websocket closed")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[block_hash] = future
+        try:
+            await asyncio.wait_for(future, timeout)
+        finally:
+            self._waiters.pop(block_hash, None)
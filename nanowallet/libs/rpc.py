@@ -1,6 +1,8 @@
-from typing import Any, Dict, List, Optional, Protocol
-from nanorpc.client import NanoRpcTyped
-from nanowallet.errors import try_raise_error, block_not_found, BlockNotFoundError
+from typing import Any, Dict, List, Optional, Protocol, Union
+import asyncio
+from nanowallet.errors import try_raise_error, BlockNotFoundError
+from nanowallet.libs.rpc_cache import BlockInfoStore, TTLCache, is_block_immutable
+from nanowallet.libs.transport import PooledNanoRpc, PooledNanoRpcTyped
 import logging
 
 # Configure logging
@@ -56,25 +58,140 @@ class NanoRpcProtocol(Protocol):
     ) -> Dict[str, Any]:
         """Get account history"""
 
+    # NanoWalletRpc also provides batch(calls) and invalidate_account(account).
+    # They are optional: wallets gather the calls individually and skip the
+    # invalidation for clients that do not implement them.
+
+
+# Methods that may be referenced by the "action" key of a batch call
+BATCH_ACTIONS = frozenset(
+    {
+        "account_info",
+        "blocks_info",
+        "work_generate",
+        "process",
+        "receivable",
+        "account_history",
+    }
+)
+
+
+async def dispatch_batch(
+    rpc: NanoRpcProtocol, calls: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Dispatch batch calls to the methods of an RPC client concurrently.
+
+    Args:
+        rpc: Client implementing the methods named by the calls
+        calls: List of calls, each a dict with an "action" naming one of
+            BATCH_ACTIONS plus the keyword arguments for it
+
+    Returns:
+        List of responses in the same order as calls
+
+    Raises:
+        ValueError: If a call names an unsupported action
+    """
+    for call in calls:
+        if call.get("action") not in BATCH_ACTIONS:
+            raise ValueError(f"Unsupported batch action: {call.get('action')}")
+
+    return list(
+        await asyncio.gather(
+            *(
+                getattr(rpc, call["action"])(
+                    **{k: v for k, v in call.items() if k != "action"}
+                )
+                for call in calls
+            )
+        )
+    )
+
 
 class NanoWalletRpc:
     """Abstraction layer for Nano RPC operations"""
 
+    BATCH_ACTIONS = BATCH_ACTIONS
+
     def __init__(
-        self, url: str, username: Optional[str] = None, password: Optional[str] = None
+        self,
+        url: Union[str, List[str]],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        cache_size: int = 1024,
+        cache_ttl: float = 300.0,
+        retries: int = 3,
+        backoff: float = 0.2,
+        cache_path: Optional[str] = None,
+        connection_limit: int = 32,
+        keepalive_timeout: float = 60,
+        account_info_ttl: float = 0.0,
     ):
         """
         Initialize RPC client with connection details.
 
         Args:
-            url: RPC endpoint URL
+            url: RPC endpoint URL, or a list of URLs to fail over between
             username: Optional username for authentication
             password: Optional password for authentication
+            cache_size: Maximum number of immutable block infos kept in memory
+            cache_ttl: Seconds a cached block info stays valid, 0 disables caching
+            retries: Number of attempts per request across all endpoints
+            backoff: Base delay in seconds between attempts, doubled each time
+            cache_path: Optional SQLite file that persists confirmed block infos
+            connection_limit: Maximum number of pooled keep-alive connections
+            keepalive_timeout: Seconds an idle pooled connection is kept open
+            account_info_ttl: Seconds an account_info response is reused,
+                0 (default) disables it
         """
-        self._rpc = NanoRpcTyped(
-            url=url, username=username, password=password, wrap_json=True
+        urls = [url] if isinstance(url, str) else list(url)
+        if not urls:
+            raise ValueError("At least one RPC endpoint URL is required")
+        # Route all requests through one keep-alive connection pool instead
+        # of opening a new session (and TCP/TLS handshake) per call
+        self._transport = PooledNanoRpc(
+            url=urls,
+            username=username,
+            password=password,
+            connection_limit=connection_limit,
+            keepalive_timeout=keepalive_timeout,
+            max_retries=retries,
+            backoff=backoff,
         )
-        logger.debug("Initialized RPC client with URL: %s", url)
+        self._rpc = PooledNanoRpcTyped(self._transport)
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._account_cache = TTLCache(maxsize=cache_size, ttl=account_info_ttl)
+        self._store = BlockInfoStore(cache_path) if cache_path else None
+        logger.debug("Initialized RPC client with URLs: %s", urls)
+
+    async def close(self) -> None:
+        """Close the underlying connection pool and the block info store"""
+        await self._transport.close()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    async def __aenter__(self) -> "NanoWalletRpc":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def cache_clear(self) -> None:
+        """Drop all cached responses, including the persistent block info store"""
+        self._cache.clear()
+        self._account_cache.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Get block info cache hit/miss counters and size"""
+        return self._cache.info()
+
+    def invalidate_account(self, account: str) -> None:
+        """Drop the cached account_info response of an account"""
+        self._account_cache.pop(account)
 
     async def account_info(
         self,
@@ -98,6 +215,19 @@ class NanoWalletRpc:
         Returns:
             Dict containing account information
         """
+        # With account_info_ttl set, block params built right after a reload
+        # reuse its response
+        flags = (
+            include_representative,
+            include_weight,
+            include_receivable,
+            include_confirmed,
+        )
+        cached = self._account_cache.get(account)
+        if cached is not None and cached[0] == flags:
+            logger.debug("Serving account info for %s from cache", account)
+            return cached[1]
+
         logger.debug("Fetching account info for %s", account)
         response = await self._rpc.account_info(
             account,
@@ -107,6 +237,7 @@ class NanoWalletRpc:
             include_confirmed=include_confirmed,
         )
         try_raise_error(response)
+        self._account_cache.set(account, (flags, response))
         return response
 
     async def blocks_info(
@@ -129,17 +260,63 @@ class NanoWalletRpc:
         Returns:
             Dict containing block information
         """
-        logger.debug("Fetching info for blocks: %s", hashes)
+        # Confirmed blocks with a successor never change, so they are cached
+        flags = (include_source, include_receive_hash, json_block)
+        cached = {}
+        missing = []
+        for block_hash in hashes:
+            block_info = self._cache.get(("blocks_info", block_hash, flags))
+            if block_info is None:
+                missing.append(block_hash)
+            else:
+                cached[block_hash] = block_info
+        if missing and self._store is not None:
+            # SQLite access blocks, so it runs off the event loop
+            stored = await asyncio.get_running_loop().run_in_executor(
+                None, self._store.get_many, missing, repr(flags)
+            )
+            # Stores written by older versions may hold head-of-chain blocks
+            stored = {
+                block_hash: block_info
+                for block_hash, block_info in stored.items()
+                if is_block_immutable(block_info, include_receive_hash)
+            }
+            for block_hash, block_info in stored.items():
+                self._cache.set(("blocks_info", block_hash, flags), block_info)
+            cached.update(stored)
+            missing = [block_hash for block_hash in missing if block_hash not in stored]
+        if not missing:
+            logger.debug("Serving info for %d blocks from cache", len(hashes))
+            return {"blocks": cached}
+
+        logger.debug(
+            "Fetching info for %d blocks (%d cached)", len(missing), len(cached)
+        )
         response = await self._rpc.blocks_info(
-            hashes,
+            missing,
             source=include_source,
             receive_hash=include_receive_hash,
             json_block=json_block,
         )
-        if block_not_found(response):
-            for hash in hashes:
-                raise BlockNotFoundError(f"Block not found {hash}")
-        try_raise_error(response)
+        if "error" in response:
+            if response["error"] == "Block not found":
+                raise BlockNotFoundError(f"Block not found {', '.join(missing)}")
+            try_raise_error(response)
+
+        immutable = [
+            (block_hash, block_info)
+            for block_hash, block_info in response.get("blocks", {}).items()
+            if is_block_immutable(block_info, include_receive_hash)
+        ]
+        for block_hash, block_info in immutable:
+            self._cache.set(("blocks_info", block_hash, flags), block_info)
+        if immutable and self._store is not None:
+            # One write and commit per call, off the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._store.set_many, immutable, repr(flags)
+            )
+        if cached:
+            response = {**response, "blocks": {**cached, **response["blocks"]}}
         return response
 
     async def work_generate(
@@ -171,7 +348,7 @@ class NanoWalletRpc:
             Dict containing process result
         """
         logger.debug("Processing block: %s", block)
-        response = await self._rpc.process(block)
+        response = await self._rpc.process(block, json_block=True)
         try_raise_error(response)
         return response
 
@@ -231,3 +408,24 @@ class NanoWalletRpc:
         )
         try_raise_error(response)
         return response
+
+    async def batch(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute several RPC calls as one batch.
+
+        The node RPC has no batch envelope, so the calls are dispatched
+        concurrently and the wall-clock cost is a single round-trip instead
+        of one per call.
+
+        Args:
+            calls: List of calls, each a dict with an "action" naming one of
+                the methods of this class plus the keyword arguments for it
+
+        Returns:
+            List of responses in the same order as calls
+
+        Raises:
+            ValueError: If a call names an unsupported action
+        """
+        logger.debug("Dispatching batch of %s calls", len(calls))
+        return await dispatch_batch(self, calls)
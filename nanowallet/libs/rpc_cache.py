@@ -0,0 +1,157 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+import json
+import sqlite3
+import threading
+import time
+
+ZERO_HASH = "0" * 64
+# Lowest host parameter limit of supported SQLite builds (before 3.32)
+SQLITE_MAX_VARIABLES = 999
+
+
+class TTLCache:
+    """Bounded in-memory cache with per-entry expiry and LRU eviction"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries, least recently used are evicted first
+            ttl: Seconds an entry stays valid, 0 disables the cache
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the oldest entries when full"""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove the entry for key if present"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+def is_block_immutable(block_info: Dict[str, Any], include_receive_hash: bool) -> bool:
+    """
+    Check if a blocks_info entry can no longer change.
+
+    A confirmed block is immutable, except for the successor of the head of
+    an account chain and the receive_hash of a send block that has not been
+    received yet.
+    """
+    if block_info.get("confirmed") != "true":
+        return False
+    if block_info.get("successor") == ZERO_HASH:
+        return False
+    if include_receive_hash and block_info.get("subtype") == "send":
+        return block_info.get("receive_hash", ZERO_HASH) != ZERO_HASH
+    return True
+
+
+class BlockInfoStore:
+    """
+    SQLite backed store for immutable blocks_info entries.
+
+    Unlike TTLCache, entries survive restarts, so a wallet reopened on a
+    known account does not fetch its confirmed blocks again. The methods are
+    blocking and thread-safe, so async callers run them in an executor.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: Database file path, ":memory:" keeps it in memory
+        """
+        self.path = path
+        # One connection shared by the executor threads, serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS block_info ("
+            "hash TEXT NOT NULL, flags TEXT NOT NULL, json BLOB NOT NULL, "
+            "inserted INTEGER NOT NULL, PRIMARY KEY (hash, flags))"
+        )
+        self._conn.commit()
+
+    def get_many(self, hashes: List[str], flags: str) -> Dict[str, Dict[str, Any]]:
+        """Return the stored block infos for the given hashes that are present"""
+        rows = []
+        # One variable is taken by flags, the rest by the hashes of a chunk
+        chunk_size = SQLITE_MAX_VARIABLES - 1
+        with self._lock:
+            for i in range(0, len(hashes), chunk_size):
+                chunk = hashes[i : i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(
+                    self._conn.execute(
+                        f"SELECT hash, json FROM block_info "
+                        f"WHERE flags = ? AND hash IN ({placeholders})",
+                        (flags, *chunk),
+                    )
+                )
+        return {block_hash: json.loads(data) for block_hash, data in rows}
+
+    def set_many(self, block_infos: Iterable[tuple], flags: str) -> None:
+        """Store (hash, block_info) pairs, keeping entries that already exist"""
+        inserted = int(time.time())
+        rows = [
+            (block_hash, flags, json.dumps(block_info), inserted)
+            for block_hash, block_info in block_infos
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO block_info (hash, flags, json, inserted) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Delete all stored entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM block_info")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,263 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+import asyncio
+import logging
+import time
+
+from aiohttp import (
+    ClientConnectorError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    ServerDisconnectedError,
+    TCPConnector,
+)
+from nanorpc.client import NanoRpcTyped
+from nanorpc.client_dynamic import MaxRetriesExceededError, NanoRpc, NodeVersion
+
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the per-endpoint latency average
+LATENCY_EMA_ALPHA = 0.3
+
+
+@dataclass
+class EndpointState:
+    """Health and latency tracking for one RPC endpoint"""
+
+    url: str
+    latency: Optional[float] = None  # Exponential moving average in seconds
+    unhealthy_until: float = 0.0  # Monotonic time the cooldown ends
+    failures: int = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.unhealthy_until <= now
+
+
+class PooledNanoRpc(NanoRpc):
+    """
+    NanoRpc client that sends all requests over one keep-alive session.
+
+    When several endpoints are given, requests go to the healthy endpoint
+    with the lowest average latency. Failing endpoints are skipped for a
+    cooldown period and the request is retried on the next one.
+    """
+
+    RETRY_ON_EXCEPTIONS = NanoRpc.RETRY_ON_EXCEPTIONS + (
+        ClientResponseError,
+        ServerDisconnectedError,
+    )
+    # Actions that must not be sent twice. A publish that timed out may have
+    # been accepted, and resending it only yields "Old block" or fork errors,
+    # so these are only retried when the connection was never established.
+    NON_IDEMPOTENT_ACTIONS = frozenset({"process"})
+
+    def __init__(
+        self,
+        url: Union[str, List[str]],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        connection_limit: int = 32,
+        keepalive_timeout: float = 60,
+        dns_cache_ttl: int = 300,
+        max_retries: int = 3,
+        backoff: float = 0.2,
+        cooldown: float = 30.0,
+        request_timeout: float = 30.0,
+    ):
+        """
+        Initialize the client. The session is created lazily on first use.
+
+        Args:
+            url: RPC endpoint URL, or a list of URLs to fail over between
+            username: Optional username for authentication
+            password: Optional password for authentication
+            connection_limit: Maximum number of pooled connections
+            keepalive_timeout: Seconds an idle connection is kept open
+            dns_cache_ttl: Seconds a resolved host name is cached
+            max_retries: Number of attempts per request across all endpoints
+            backoff: Base delay in seconds, doubled after each failed attempt
+            cooldown: Seconds a failing endpoint is skipped
+            request_timeout: Total timeout in seconds for a single request
+        """
+        urls = [url] if isinstance(url, str) else list(url)
+        if not urls:
+            raise ValueError("At least one RPC endpoint URL is required")
+        super().__init__(
+            url=urls[0],
+            node_version=NodeVersion.V27_1,
+            max_retries=max_retries,
+            username=username,
+            password=password,
+            wrap_json=True,
+        )
+        self.endpoints = [EndpointState(url=endpoint_url) for endpoint_url in urls]
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.request_timeout = request_timeout
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._post_headers = {**self.headers, "Content-Type": "application/json"}
+
+    async def _get_session(self) -> ClientSession:
+        """Return the shared session, creating it for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if (
+            self.session is None
+            or self.session.closed
+            or self._session_loop is not loop
+        ):
+            await self._close_stale_session()
+            connector = TCPConnector(
+                limit=self.connection_limit,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self.session = ClientSession(
+                auth=self.auth,
+                connector=connector,
+                timeout=ClientTimeout(total=self.request_timeout),
+            )
+            self._session_loop = loop
+            logger.debug("Opened pooled RPC session for %s", self.url)
+        return self.session
+
+    async def _close_stale_session(self) -> None:
+        """Close a session that was created on another event loop"""
+        session, loop = self.session, self._session_loop
+        self.session = None
+        self._session_loop = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            # The loop still runs in another thread, close the session there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        try:
+            await session.close()
+        except RuntimeError:
+            # The connections are closed, only waiting for them needs the
+            # old loop; release the connector without it
+            session.detach()
+        logger.debug("Closed pooled RPC session of a previous event loop")
+
+    def _select_endpoint(self) -> EndpointState:
+        """Return the fastest healthy endpoint, or the one recovering first"""
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.is_healthy(now)]
+        if not healthy:
+            return min(self.endpoints, key=lambda endpoint: endpoint.unhealthy_until)
+        # Endpoints without a latency sample yet are tried first
+        return min(
+            healthy,
+            key=lambda endpoint: (
+                endpoint.latency if endpoint.latency is not None else 0.0
+            ),
+        )
+
+    def _record_success(self, endpoint: EndpointState, elapsed: float) -> None:
+        if endpoint.latency is None:
+            endpoint.latency = elapsed
+        else:
+            endpoint.latency += LATENCY_EMA_ALPHA * (elapsed - endpoint.latency)
+        endpoint.failures = 0
+        endpoint.unhealthy_until = 0.0
+
+    def _record_failure(self, endpoint: EndpointState) -> None:
+        endpoint.failures += 1
+        endpoint.unhealthy_until = time.monotonic() + self.cooldown
+
+    async def process_payloads(self, payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send the request, failing over between endpoints with backoff"""
+        last_error: Optional[BaseException] = None
+        idempotent = payloads[0].get("action") not in self.NON_IDEMPOTENT_ACTIONS
+        for attempt in range(self.max_retries):
+            endpoint = self._select_endpoint()
+            started = time.monotonic()
+            try:
+                response = await self._request(payloads, endpoint.url)
+            except self.RETRY_ON_EXCEPTIONS as e:
+                last_error = e
+                self._record_failure(endpoint)
+                logger.warning(
+                    "RPC request to %s failed (attempt %d/%d): %s",
+                    endpoint.url,
+                    attempt + 1,
+                    self.max_retries,
+                    str(e) or type(e).__name__,
+                )
+                if not idempotent and not isinstance(e, ClientConnectorError):
+                    # The node may have received the request, do not resend
+                    raise
+                # Rotate immediately while another endpoint is available
+                now = time.monotonic()
+                if attempt < self.max_retries - 1 and not any(
+                    other.is_healthy(now) for other in self.endpoints
+                ):
+                    await asyncio.sleep(self.backoff * 2**attempt)
+                continue
+            self._record_success(endpoint, time.monotonic() - started)
+            return response
+
+        raise MaxRetriesExceededError(
+            f"All {self.max_retries} retries exhausted. Last error: {last_error}"
+        )
+
+    async def _request(
+        self, payloads: List[Dict[str, Any]], url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        session = await self._get_session()
+        # Encode and decode the body directly; orjson is used when installed
+        async with session.post(
+            url or self.url, data=_json_dumps(payloads[0]), headers=self._post_headers
+        ) as response:
+            if response.status >= 500:
+                # Server side failures are retried, possibly on another endpoint
+                response.raise_for_status()
+            response_data = _json_loads(await response.read())
+            if self.wrap_json and not isinstance(response_data, dict):
+                # Wrap the response data in a JSON structure
+                response_data = {
+                    "msg": response_data,
+                    "error": "wrapped into valid json",
+                }
+            return response_data
+
+    async def close(self) -> None:
+        """Close the session and release all pooled connections"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._session_loop = None
+
+
+class PooledNanoRpcTyped(NanoRpcTyped):
+    """NanoRpcTyped that sends its requests through a PooledNanoRpc"""
+
+    def __init__(self, transport: PooledNanoRpc):
+        """
+        Initialize the typed client on top of an existing transport.
+
+        NanoRpcTyped builds its own NanoRpc in __init__, which would open a
+        separate session, so the parent constructor is not called.
+
+        Args:
+            transport: Pooled client all typed calls are delegated to
+        """
+        # pylint: disable=super-init-not-called
+        self.rpc = transport
@@ -2,11 +2,15 @@
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Optional
+import sys
 from .utils.conversion import _raw_to_nano
 from .libs.account_helper import AccountHelper
 
+# Models created per RPC result use __slots__ where dataclasses support it
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class WalletConfig:
     """Configuration for NanoWallet"""
 
@@ -14,9 +18,14 @@ class WalletConfig:
     default_representative: str = (
         "nano_3msc38fyn67pgio16dj586pdrceahtn75qgnx7fy19wscixrc8dbb3abhbw6"
     )
+    max_concurrency: int = 8  # Upper bound for concurrent RPC requests
+    local_pow: bool = False  # Solve PoW on this machine, falling back to the RPC
+    reload_ttl: float = 0.5  # Seconds has_balance/list_receivables reuse a reload
+    ws_url: Optional[str] = None  # Node websocket to push confirmations over
+    precache_work: bool = False  # Generate work for the next block after each publish
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WalletBalance:
     """Balance information for a wallet"""
 
@@ -34,7 +43,7 @@ class WalletBalance:
         return _raw_to_nano(self.receivable_raw)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AccountInfo:
     """Detailed account information"""
 
@@ -53,7 +62,7 @@ class AccountInfo:
         return _raw_to_nano(self.weight_raw)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Receivable:
     """Represents a pending transaction waiting to be received"""
 
@@ -66,7 +75,7 @@ class Receivable:
         return _raw_to_nano(self.amount_raw)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class ReceivedBlock:
     """Represents a received block with its details"""
 
@@ -81,7 +90,7 @@ class ReceivedBlock:
         return _raw_to_nano(self.amount_raw)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class AmountReceived:
     amount_raw: int
 
@@ -91,7 +100,7 @@ class AmountReceived:
         return _raw_to_nano(self.amount_raw)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Transaction:
     """Represents a confirmed transaction in account history"""
 
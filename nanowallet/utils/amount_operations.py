@@ -1,14 +1,17 @@
-from typing import List
+from typing import Iterable
 from ..models import ReceivedBlock, AmountReceived
 
 
-def sum_received_amount(receive_all_response: List[ReceivedBlock]) -> AmountReceived:
+def sum_received_amount(
+    receive_all_response: Iterable[ReceivedBlock],
+) -> AmountReceived:
     """
-    Sums the amount_raw values from a list of receivable responses.
+    Sums the amount_raw values from a list of receive responses.
+    The raw integers are added in a single pass; the Nano value is only
+    derived from the total when AmountReceived.amount is accessed.
     Args:
-        receive_all_response: A list of dictionaries containing 'amount_raw'
+        receive_all_response: An iterable of ReceivedBlock objects
     Returns:
-        dict: A dictionary with the total amount in raw and Nano
+        AmountReceived: The total amount in raw
     """
-    total_amount_raw = sum(item.amount_raw for item in receive_all_response)
-    return AmountReceived(total_amount_raw)
+    return AmountReceived(sum(item.amount_raw for item in receive_all_response))
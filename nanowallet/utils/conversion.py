@@ -4,47 +4,49 @@ from nanowallet.errors import InvalidAmountError
 from .validation import validate_nano_amount
 
 RAW_PER_NANO = Decimal("10") ** 30
+RAW_DECIMALS = 30
+_RAW_PER_NANO_INT = 10**RAW_DECIMALS
 
 
 def _raw_to_nano(raw_amount: Union[int, str, Decimal], decimal_places=30) -> Decimal:
     """
     Convert raw amount to nano with configurable decimal places precision.
     1 nano = 10^30 raw
+
+    The split into whole and fractional nano is done with integer arithmetic,
+    so the result is exact regardless of the active Decimal context.
     """
-    raw_decimal = Decimal(str(raw_amount))
-    nano_amount = raw_decimal / RAW_PER_NANO
-
-    # Convert to string with full precision
-    nano_str = format(nano_amount, "f")
-
-    # Split into integer and decimal parts
-    if "." in nano_str:
-        int_part, dec_part = nano_str.split(".")
-        # Truncate decimal part to specified places
-        dec_part = dec_part[:decimal_places]
-        # Pad with zeros if needed
-        dec_part = dec_part.ljust(decimal_places, "0")
-        truncated_str = f"{int_part}.{dec_part}"
-    else:
-        # Handle whole numbers
-        truncated_str = f"{nano_str}.{'0' * decimal_places}"
-
-    # Convert back to Decimal
-    return Decimal(
-        truncated_str.rstrip("0").rstrip(".") if "." in truncated_str else truncated_str
-    )
+    raw = int(raw_amount)
+    whole, fraction = divmod(abs(raw), _RAW_PER_NANO_INT)
+    if not fraction:
+        # Whole Nano amounts need no fractional formatting
+        return Decimal(-whole if raw < 0 else whole)
+
+    # Truncate to the requested decimal places and drop trailing zeros
+    fraction_str = f"{fraction:0{RAW_DECIMALS}d}"[:decimal_places].rstrip("0")
+    if not whole and not fraction_str:
+        return Decimal(0)
+    sign = "-" if raw < 0 else ""
+    if fraction_str:
+        return Decimal(f"{sign}{whole}.{fraction_str}")
+    return Decimal(f"{sign}{whole}")
 
 
 def _nano_to_raw(nano_amount: Union[str, Decimal, int]) -> int:
     """
-    Convert nano amount to raw
+    Convert nano amount to raw, truncating digits beyond the raw precision.
     1 nano = 10^30 raw
     """
     nano_decimal = Decimal(str(nano_amount))
+    if not nano_decimal.is_finite():
+        raise InvalidAmountError("Amount must be a finite number")
     if nano_decimal < 0:
         raise InvalidAmountError("Negative values are not allowed")
-    raw_amount = nano_decimal * RAW_PER_NANO
-    return int(raw_amount)
+
+    # Exact integer ratio instead of a Decimal multiply, which would round
+    # to the context precision; floor division truncates extra digits
+    numerator, denominator = nano_decimal.as_integer_ratio()
+    return numerator * _RAW_PER_NANO_INT // denominator
 
 
 def raw_to_nano(amount_raw: int, decimal_places=6) -> Decimal:
@@ -75,6 +77,8 @@ def nano_to_raw(amount_nano: Decimal | str | int, decimal_places=30) -> int:
         ValueError: If amount is negative or invalid format
     """
     amount_decimal = validate_nano_amount(amount_nano)
-    return _nano_to_raw(
-        _raw_to_nano(_nano_to_raw(amount_decimal), decimal_places=decimal_places)
-    )
+    raw = _nano_to_raw(amount_decimal)
+    if 0 <= decimal_places < RAW_DECIMALS:
+        # Truncate to decimal_places directly in raw
+        raw -= raw % 10 ** (RAW_DECIMALS - decimal_places)
+    return raw
@@ -1,5 +1,6 @@
 import functools
 import logging
+from contextvars import ContextVar
 from typing import Generic, TypeVar, Callable, Awaitable, Optional
 from ..errors import NanoException
 
@@ -40,22 +41,39 @@ class NanoResult(Generic[T]):
 
 R = TypeVar("R")
 
+# ids of the wallets whose reload_after call is in progress in this task
+_RELOAD_SCOPE: "ContextVar[frozenset]" = ContextVar(
+    "nanowallet_reload_scope", default=frozenset()
+)
+
 
 def reload_after(func: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """
+    Reload the wallet after the call succeeds.
+
+    Nested calls on the same wallet (e.g. receive_all inside sweep) skip
+    their reload, the outermost call reloads once when it finishes.
+    """
+
     @functools.wraps(func)
     async def wrapper(self, *args, **kwargs):
+        scope = _RELOAD_SCOPE.get()
+        if id(self) in scope:
+            return await func(self, *args, **kwargs)
+
+        token = _RELOAD_SCOPE.set(scope | {id(self)})
         try:
             result = await func(self, *args, **kwargs)
-            await self.reload()
-            return result
-        except Exception as e:
-            raise e
+        finally:
+            _RELOAD_SCOPE.reset(token)
+        await self.reload()
+        return result
 
     return wrapper
 
 
 def handle_errors(
-    func: Callable[..., Awaitable[R]]
+    func: Callable[..., Awaitable[R]],
 ) -> Callable[..., Awaitable[NanoResult[R]]]:  # Return NanoResult parameterized with R
     @functools.wraps(func)
     async def wrapper(*args, **kwargs) -> NanoResult[R]:
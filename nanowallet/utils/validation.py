@@ -1,5 +1,6 @@
 # nanowallet/utils/validation.py
 from decimal import Decimal
+from functools import lru_cache
 from typing import Union
 from ..errors import InvalidAmountError
 from ..libs.account_helper import AccountHelper
@@ -34,8 +35,14 @@ def validate_nano_amount(amount: Union[str, Decimal, int]) -> Decimal:
     if isinstance(amount, float):
         raise InvalidAmountError("Float values are not allowed to avoid precision loss")
 
+    return _parse_nano_amount(str(amount))
+
+
+@lru_cache(maxsize=2048)
+def _parse_nano_amount(amount: str) -> Decimal:
+    """Parse a canonical amount string, memoized since Decimal is immutable"""
     try:
-        amount_decimal = Decimal(str(amount))
+        amount_decimal = Decimal(amount)
         if amount_decimal < 0:
             raise InvalidAmountError("Negative values are not allowed")
         return amount_decimal
@@ -1,7 +1,12 @@
 # nanowallet/wallets/base.py
-from typing import Optional, Dict, Any
-from ..libs.rpc import NanoWalletRpc
+import asyncio
+from typing import Optional, Dict, Any, Iterable, Awaitable, List
+from ..libs.rpc import NanoWalletRpc, dispatch_batch
 from ..models import WalletConfig, WalletBalance, AccountInfo
+from ..errors import RpcError
+
+# Maximum number of hashes sent in one blocks_info request
+BLOCKS_INFO_CHUNK_SIZE = 256
 
 
 class NanoWalletBase:
@@ -20,18 +25,37 @@ class NanoWalletBase:
         """Initialize account state variables"""
         self.account = None
         self.receivable_blocks = {}
+        self._receivable_amounts = []  # (amount_raw, block_hash), largest first
+        self._reloaded_at: Optional[float] = None  # Monotonic time of the last reload
         self._balance_info = WalletBalance()
         self._account_info = AccountInfo(account=self.account)
 
+    def _account_info_args(self) -> Dict[str, Any]:
+        """Arguments of every account_info request made by the wallet"""
+        return {
+            "account": self.account,
+            "include_weight": True,
+            "include_receivable": True,
+            "include_representative": True,
+            "include_confirmed": False,
+        }
+
     async def _fetch_account_info(self) -> Dict[str, Any]:
         """Get account information from RPC"""
-        return await self.rpc.account_info(
-            self.account,
-            include_weight=True,
-            include_receivable=True,
-            include_representative=True,
-            include_confirmed=False,
-        )
+        return await self.rpc.account_info(**self._account_info_args())
+
+    async def _batch(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute RPC calls with rpc.batch, or concurrently without it"""
+        batch = getattr(self.rpc, "batch", None)
+        if batch is not None:
+            return await batch(calls)
+        return await dispatch_batch(self.rpc, calls)
+
+    def _invalidate_account(self) -> None:
+        """Drop the client's cached account state, if it keeps any"""
+        invalidate = getattr(self.rpc, "invalidate_account", None)
+        if invalidate is not None:
+            invalidate(self.account)
 
     async def _block_info(self, block_hash: str) -> Dict[str, Any]:
         """Get block information"""
@@ -42,3 +66,62 @@ class NanoWalletBase:
             json_block=True,
         )
         return response["blocks"][block_hash]
+
+    async def _blocks_info(self, block_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get information for several blocks with bulk requests.
+
+        Hashes are sent in chunks of BLOCKS_INFO_CHUNK_SIZE, fetched
+        concurrently, so large backlogs do not end up in one huge response.
+        A chunk falls back to concurrent per-block lookups if the node
+        rejects the bulk request (e.g. because of a hash count limit).
+        """
+        chunks = [
+            block_hashes[i : i + BLOCKS_INFO_CHUNK_SIZE]
+            for i in range(0, len(block_hashes), BLOCKS_INFO_CHUNK_SIZE)
+        ]
+        blocks: Dict[str, Dict[str, Any]] = {}
+        for chunk_blocks in await self._gather_bounded(
+            self._blocks_info_chunk(chunk) for chunk in chunks
+        ):
+            blocks.update(chunk_blocks)
+        return blocks
+
+    async def _blocks_info_chunk(
+        self, block_hashes: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get information for one chunk of blocks"""
+        try:
+            response = await self.rpc.blocks_info(
+                block_hashes,
+                include_source=True,
+                include_receive_hash=True,
+                json_block=True,
+            )
+            return response["blocks"]
+        except RpcError:
+            blocks = await self._gather_bounded(
+                self._block_info(block_hash) for block_hash in block_hashes
+            )
+            return dict(zip(block_hashes, blocks))
+
+    async def _gather_bounded(self, awaitables: Iterable[Awaitable[Any]]) -> List[Any]:
+        """
+        Await RPC calls concurrently, at most config.max_concurrency at a time.
+
+        All calls run to completion before the first failure (in input order)
+        is raised, so no request is left in flight.
+        """
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def bounded(awaitable: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await awaitable
+
+        results = await asyncio.gather(
+            *(bounded(awaitable) for awaitable in awaitables), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
@@ -2,11 +2,16 @@
 from typing import Optional, Protocol, Dict, Any, List
 from decimal import Decimal
 import asyncio
-import time
+import functools
 import logging
 
+from aiohttp import ClientError
+from nano_lib_py.work import WORK_DIFFICULTY, solve_work
+
 from ..libs.account_helper import AccountHelper
-from ..libs.block import NanoWalletBlock
+from ..libs.block import NanoWalletBlock, work_hash
+from ..libs.confirmations import ConfirmationListener
+from ..libs.rpc_cache import TTLCache
 from ..models import WalletConfig, Receivable, Transaction, ReceivedBlock
 from ..utils.conversion import _raw_to_nano, _nano_to_raw
 from ..utils.validation import validate_nano_amount
@@ -28,6 +33,9 @@ logger = logging.getLogger(__name__)
 # Constants
 ZERO_HASH = "0" * 64
 DEFAULT_THRESHOLD_RAW = 10**24
+WORK_CACHE_SIZE = 64
+WORK_CACHE_TTL = 3600
+LOCAL_POW_TIMEOUT = 30  # Seconds before local PoW gives up and uses the RPC
 
 
 class NanoWalletKeyProtocol(NanoWalletReadOnlyProtocol, Protocol):
@@ -86,8 +94,33 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         account = AccountHelper.get_account_address(private_key)
         super().__init__(rpc, account, config)
         self.private_key = private_key
+        # Generated work by work hash, so retries on the same frontier reuse it
+        self._work_cache = TTLCache(maxsize=WORK_CACHE_SIZE, ttl=WORK_CACHE_TTL)
+        self._confirmations = (
+            ConfirmationListener(self.config.ws_url, self.account)
+            if self.config.ws_url
+            else None
+        )
 
-    async def _build_block(
+    def _new_block(
+        self,
+        previous: str,
+        representative: str,
+        balance: int,
+        source_hash: Optional[str] = None,
+        destination_account: Optional[str] = None,
+    ) -> NanoWalletBlock:
+        """Creates an unsigned state block for this account"""
+        return NanoWalletBlock(
+            account=self.account,
+            previous=previous,
+            representative=representative,
+            balance=balance,
+            source_hash=source_hash,
+            destination_account=destination_account,
+        )
+
+    async def _sign_block(
         self,
         previous: str,
         representative: str,
@@ -96,19 +129,17 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         destination_account: Optional[str] = None,
     ) -> NanoWalletBlock:
         """
-        Builds a state block with the given parameters.
+        Creates and signs a state block, without work.
 
         :param previous: Previous block hash or zeros for first block
         :param representative: Representative account
         :param balance: Account balance after this block
         :param source_hash: Hash of send block to receive (for receive blocks)
         :param destination_account: Destination account (for send blocks)
-        :return: Block instance
+        :return: Signed block instance
         :raises ValueError: If parameters are invalid
         """
-
-        block = NanoWalletBlock(
-            account=self.account,
+        block = self._new_block(
             previous=previous,
             representative=representative,
             balance=balance,
@@ -116,29 +147,121 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
             destination_account=destination_account,
         )
 
-        block.sign(self.private_key)
-        work = await self._generate_work(block.work_block_hash)
-        block.set_work(work)
+        # Signing takes about a millisecond, run it off the event loop so
+        # in-flight RPCs such as work generation keep making progress
+        await asyncio.get_running_loop().run_in_executor(
+            None, block.sign, self.private_key
+        )
+        return block
+
+    async def _build_block(
+        self,
+        previous: str,
+        representative: str,
+        balance: int,
+        source_hash: Optional[str] = None,
+        destination_account: Optional[str] = None,
+    ) -> NanoWalletBlock:
+        """
+        Builds a state block with the given parameters.
+
+        :param previous: Previous block hash or zeros for first block
+        :param representative: Representative account
+        :param balance: Account balance after this block
+        :param source_hash: Hash of send block to receive (for receive blocks)
+        :param destination_account: Destination account (for send blocks)
+        :return: Block instance
+        :raises ValueError: If parameters are invalid
+        """
+        # The work hash is known from previous alone, so work generation runs
+        # while the block is being signed
+        work_task = asyncio.ensure_future(
+            self._generate_work(work_hash(self.account, previous))
+        )
+        try:
+            block = await self._sign_block(
+                previous=previous,
+                representative=representative,
+                balance=balance,
+                source_hash=source_hash,
+                destination_account=destination_account,
+            )
+        except BaseException:
+            work_task.cancel()
+            raise
+        block.set_work(await work_task)
         return block
 
     async def _generate_work(self, pow_hash: str) -> str:
         """
         Generate proof of work for a block.
 
+        Work that was generated (or is being generated) for the same hash
+        is reused instead of being requested again.
+
         :param pow_hash: The hash to generate work for
         :return: The generated work value
         :raises ValueError: If work generation fails
         """
-        response = await self.rpc.work_generate(
-            pow_hash, use_peers=self.config.use_work_peers
-        )
-        return response["work"]
+        # Shielded, so a cancelled caller does not abort work others may await
+        return await asyncio.shield(self._work_task(pow_hash))
+
+    def _work_task(self, pow_hash: str) -> "asyncio.Task[str]":
+        """Return the cached work task for pow_hash, starting one if needed"""
+        task = self._work_cache.get(pow_hash)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._request_work(pow_hash))
+            task.add_done_callback(
+                functools.partial(self._forget_failed_work, pow_hash)
+            )
+            self._work_cache.set(pow_hash, task)
+        return task
+
+    def _forget_failed_work(self, pow_hash: str, task: "asyncio.Task[str]") -> None:
+        """Drop a failed work task from the cache so the next call retries"""
+        if task.cancelled() or task.exception() is not None:
+            if self._work_cache.get(pow_hash) is task:
+                self._work_cache.pop(pow_hash)
+
+    async def _request_work(self, pow_hash: str) -> str:
+        """Solve work locally if configured, otherwise request it from the RPC"""
+        work = None
+        if self.config.local_pow:
+            work = await self._solve_work_locally(pow_hash)
+        if work is None:
+            response = await self.rpc.work_generate(
+                pow_hash, use_peers=self.config.use_work_peers
+            )
+            work = response["work"]
+        return work
+
+    async def _solve_work_locally(self, pow_hash: str) -> Optional[str]:
+        """
+        Solve proof of work with nano_lib_py's SIMD C implementation.
+
+        Runs in the default executor so the event loop stays responsive.
+        The send difficulty is used, which is also valid for receive blocks.
+
+        :param pow_hash: The hash to generate work for
+        :return: The work value, or None if it could not be solved in time
+        """
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, solve_work, pow_hash, WORK_DIFFICULTY, LOCAL_POW_TIMEOUT
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Local work generation failed, using RPC: %s", str(e))
+            return None
 
     async def _wait_for_confirmation(
         self, block_hash: str, timeout: int = 300, raise_on_timeout: bool = False
     ) -> bool:
         """
-        Wait for block confirmation with exponential backoff.
+        Wait for block confirmation.
+
+        With config.ws_url set, the node pushes the confirmation over a
+        websocket. Otherwise, or if the websocket fails, blocks_info is
+        polled with exponential backoff.
 
         Args:
             block_hash: Hash of the block to confirm
@@ -151,7 +274,18 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         Raises:
             TimeoutException: If confirmation times out and raise_on_timeout is True
         """
-        start_time = time.time()
+        # Monotonic deadline, unaffected by wall clock adjustments
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if self._confirmations is not None:
+            confirmed = await self._wait_for_confirmation_event(block_hash, timeout)
+            if confirmed is not None:
+                if not confirmed and raise_on_timeout:
+                    raise TimeoutException(
+                        f"Block {block_hash} not confirmed within {timeout} seconds"
+                    )
+                return confirmed
+
         delay = 0.5  # Start with 500ms
         max_delay = 32  # Cap maximum delay
         attempt = 1
@@ -160,39 +294,42 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
             "Starting confirmation wait for %s with timeout=%s", block_hash, timeout
         )
 
-        while (time.time() - start_time) < timeout:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
             try:
-                block_info = await self._block_info(block_hash)
+                # A hanging request must not outlast the caller's timeout
+                block_info = await asyncio.wait_for(
+                    self._block_info(block_hash), remaining
+                )
                 confirmed = block_info.get("confirmed", "false") == "true"
 
                 logger.debug(
-                    "Confirmation check attempt %s: confirmed=%s, elapsed=%s",
+                    "Confirmation check attempt %s: confirmed=%s, remaining=%s",
                     attempt,
                     confirmed,
-                    time.time() - start_time,
+                    remaining,
                 )
 
                 if confirmed:
                     return True
 
-                # Exponential backoff with cap
-                await asyncio.sleep(delay)
-                delay = min(delay * 2, max_delay)
-                attempt += 1
-
             except BlockNotFoundError:
                 logger.debug(
                     "Block not found on attempt %s, retrying after %s seconds",
                     attempt,
                     delay,
                 )
-                await asyncio.sleep(delay)
-                delay = min(delay * 2, max_delay)
-                attempt += 1
-                continue
+            except asyncio.TimeoutError:
+                break
+
+            # Exponential backoff with cap, without sleeping past the deadline
+            await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+            delay = min(delay * 2, max_delay)
+            attempt += 1
 
-        elapsed = time.time() - start_time
-        logger.debug("Confirmation wait timed out after %s seconds", elapsed)
+        logger.debug("Confirmation wait timed out after %s seconds", timeout)
 
         if raise_on_timeout:
             raise TimeoutException(
@@ -201,6 +338,125 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
 
         return False
 
+    async def _wait_for_confirmations(
+        self, block_hashes: List[str], timeout: int = 300
+    ) -> List[bool]:
+        """
+        Wait for several blocks to confirm.
+
+        Without a websocket, each polling round checks all blocks that are
+        still unconfirmed with one blocks_info request.
+
+        :param block_hashes: Hashes of the blocks to confirm
+        :param timeout: Maximum time to wait in seconds
+        :return: True for every block
+        :raises TimeoutException: If a block is not confirmed within timeout
+        """
+        # One deadline for all blocks, shared with the polling fallback
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = list(dict.fromkeys(block_hashes))
+        if self._confirmations is not None:
+            confirmed = await self._wait_for_confirmation_events(pending, deadline)
+            if confirmed:
+                return [True] * len(block_hashes)
+            if confirmed is not None:
+                raise TimeoutException(
+                    f"Block {', '.join(pending)} not confirmed within {timeout} seconds"
+                )
+
+        delay = 0.5  # Start with 500ms
+        max_delay = 32  # Cap maximum delay
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                block_infos = await asyncio.wait_for(
+                    self._blocks_info(pending), remaining
+                )
+                pending = [
+                    block_hash
+                    for block_hash in pending
+                    if block_infos[block_hash].get("confirmed", "false") != "true"
+                ]
+            except BlockNotFoundError:
+                logger.debug("Block not found yet, retrying after %s seconds", delay)
+            except asyncio.TimeoutError:
+                break
+
+            if not pending:
+                return [True] * len(block_hashes)
+
+            # Exponential backoff with cap, without sleeping past the deadline
+            await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+            delay = min(delay * 2, max_delay)
+
+        raise TimeoutException(
+            f"Block {', '.join(pending)} not confirmed within {timeout} seconds"
+        )
+
+    async def _wait_for_confirmation_event(
+        self, block_hash: str, timeout: float
+    ) -> Optional[bool]:
+        """
+        Wait for the websocket confirmation of a block.
+
+        :param block_hash: Hash of the block to confirm
+        :param timeout: Maximum time to wait in seconds
+        :return: True if confirmed, False on timeout, None if the websocket
+            failed and the caller should poll instead
+        """
+        deadline = asyncio.get_running_loop().time() + timeout
+        return await self._wait_for_confirmation_events([block_hash], deadline)
+
+    async def _wait_for_confirmation_events(
+        self, block_hashes: List[str], deadline: float
+    ) -> Optional[bool]:
+        """
+        Wait for the websocket confirmations of several blocks.
+
+        :param block_hashes: Hashes of the blocks to confirm
+        :param deadline: Event loop time by which all blocks must be confirmed
+        :return: True if all confirmed, False on timeout, None if the websocket
+            failed and the caller should poll instead
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._confirmations as listener:
+                try:
+                    # Blocks may have been confirmed before subscribing
+                    block_infos = await asyncio.wait_for(
+                        self._blocks_info(block_hashes),
+                        max(deadline - loop.time(), 0),
+                    )
+                    pending = [
+                        block_hash
+                        for block_hash in block_hashes
+                        if block_infos[block_hash].get("confirmed", "false") != "true"
+                    ]
+                except BlockNotFoundError:
+                    pending = block_hashes
+                # Waits on the shared subscription are futures rather than
+                # requests, so they are not bounded by max_concurrency
+                await asyncio.gather(
+                    *(
+                        listener.wait(block_hash, max(deadline - loop.time(), 0))
+                        for block_hash in pending
+                    )
+                )
+                return True
+        except asyncio.TimeoutError:
+            return False
+        except (OSError, ClientError) as e:
+            # ConnectionError is a subclass of OSError
+            logger.warning(
+                "Confirmation websocket failed, polling instead: %s",
+                str(e) or type(e).__name__,
+            )
+            return None
+
     async def _process_block(self, block: NanoWalletBlock, operation: str) -> str:
         """
         Process a block and handle errors consistently.
@@ -210,9 +466,19 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         :return: Hash of the processed block
         :raises ValueError: If block processing fails
         """
-        response = await self.rpc.process(block.json())
-
+        try:
+            response = await self.rpc.process(block.json())
+        finally:
+            # The cached account state is outdated once a block was published
+            self._invalidate_account()
+            self._reloaded_at = None
+
+        # The work is spent once the block is accepted
+        self._work_cache.pop(block.work_block_hash)
         block_hash = response["hash"]
+        if self.config.precache_work:
+            # The next block of this account builds on this one
+            self._work_task(block_hash)
         logger.debug("Successfully processed %s, hash: %s", operation, block_hash)
         return block_hash
 
@@ -273,13 +539,12 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         """
         amount_decimal = validate_nano_amount(amount)
         amount_raw = _nano_to_raw(amount_decimal)
-        response = await self.send_raw(
+        return await self._send_raw(
             destination_account,
             amount_raw,
             wait_confirmation=wait_confirmation,
             timeout=timeout,
         )
-        return response.unwrap()
 
     @reload_after
     @handle_errors
@@ -301,6 +566,34 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         :raises InvalidAccountError: If destination account is invalid
         :raises InsufficientBalanceError: If insufficient balance
         """
+        return await self._send_raw(
+            destination_account,
+            amount_raw,
+            wait_confirmation=wait_confirmation,
+            timeout=timeout,
+        )
+
+    async def _send_raw(
+        self,
+        destination_account: str,
+        amount_raw: int | str,
+        wait_confirmation: bool = False,
+        timeout: int = 30,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Builds and publishes a send block, without reloading afterwards.
+
+        send, send_raw and sweep share this so a call triggers one reload
+        from its own reload_after rather than one per nested public method.
+
+        :param destination_account: The destination account
+        :param amount_raw: The amount in raw
+        :param wait_confirmation: If True, wait for confirmation
+        :param timeout: Max seconds to wait for confirmation
+        :param params: Block params already fetched by the caller
+        :return: The hash of the sent block
+        """
         logger.debug("Attempting to send %s raw to %s", amount_raw, destination_account)
 
         if not destination_account:
@@ -311,7 +604,8 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
             logger.error("Invalid destination account: %s", destination_account)
             raise InvalidAccountError("Invalid destination account.")
 
-        params = await self._get_block_params()
+        if params is None:
+            params = await self._get_block_params()
         new_balance = params["balance"] - int(amount_raw)
 
         if params["balance"] == 0 or new_balance < 0:
@@ -360,12 +654,15 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         if sweep_pending:
             await self.receive_all(threshold_raw=threshold_raw)
 
-        response = await self.send_raw(
+        # The nested receive_all does not reload, read the balance directly
+        # and build the send from the same account state
+        params = await self._get_block_params()
+        return await self._send_raw(
             destination_account,
-            self._balance_info.balance_raw,
+            params["balance"],
             wait_confirmation=wait_confirmation,
+            params=params,
         )
-        return response.unwrap()
 
     @reload_after
     @handle_errors
@@ -394,37 +691,12 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         )
 
         try:
-            send_block_info = await self._block_info(block_hash)
-            amount_raw = int(send_block_info["amount"])
-            logger.debug("Block %s contains %s raw", block_hash, amount_raw)
-
-            params = await self._get_block_params()
-            new_balance = params["balance"] + amount_raw
-            logger.debug("Building block with new_balance=%s", new_balance)
-
-            block = await self._build_block(
-                previous=params["previous"],
-                representative=params["representative"],
-                balance=new_balance,
-                source_hash=block_hash,
+            # The send block and the account state are independent lookups
+            send_block_info, params = await asyncio.gather(
+                self._block_info(block_hash), self._get_block_params()
             )
-
-            received_hash = await self._process_block(
-                block, f"receive of {amount_raw} raw from block {block_hash}"
-            )
-            logger.debug("Block processed with hash %s", received_hash)
-
-            confirmed = False
-            if wait_confirmation:
-                confirmed = await self._wait_for_confirmation(
-                    received_hash, timeout=timeout, raise_on_timeout=True
-                )
-
-            return ReceivedBlock(
-                block_hash=received_hash,
-                amount_raw=amount_raw,
-                source=send_block_info["block_account"],
-                confirmed=confirmed if wait_confirmation else False,
+            return await self._receive_block(
+                block_hash, send_block_info, params, wait_confirmation, timeout
             )
 
         except Exception as e:
@@ -433,6 +705,67 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
             )
             raise
 
+    async def _receive_block(
+        self,
+        block_hash: str,
+        send_block_info: Dict[str, Any],
+        params: Dict[str, Any],
+        wait_confirmation: bool,
+        timeout: int,
+    ) -> ReceivedBlock:
+        """
+        Receives a block whose send block info has already been fetched.
+
+        :param block_hash: Hash of the send block to receive
+        :param send_block_info: blocks_info entry of the send block
+        :param params: Block parameters of the account before this receive
+        :param wait_confirmation: If True, wait for block confirmation
+        :param timeout: Max seconds to wait for confirmation
+        :return: ReceivedBlock object with details about the received block
+        """
+        amount_raw = int(send_block_info["amount"])
+        logger.debug("Block %s contains %s raw", block_hash, amount_raw)
+
+        received_hash = await self._publish_receive(block_hash, amount_raw, params)
+        logger.debug("Block processed with hash %s", received_hash)
+
+        confirmed = False
+        if wait_confirmation:
+            confirmed = await self._wait_for_confirmation(
+                received_hash, timeout=timeout, raise_on_timeout=True
+            )
+
+        return ReceivedBlock(
+            block_hash=received_hash,
+            amount_raw=amount_raw,
+            source=send_block_info["block_account"],
+            confirmed=confirmed if wait_confirmation else False,
+        )
+
+    async def _publish_receive(
+        self, block_hash: str, amount_raw: int, params: Dict[str, Any]
+    ) -> str:
+        """
+        Builds and processes the receive block for a send block.
+
+        :param block_hash: Hash of the send block to receive
+        :param amount_raw: Amount of the send block in raw
+        :param params: Block parameters of the account before this receive
+        :return: Hash of the processed receive block
+        """
+        new_balance = params["balance"] + amount_raw
+        logger.debug("Building block with new_balance=%s", new_balance)
+
+        block = await self._build_block(
+            previous=params["previous"],
+            representative=params["representative"],
+            balance=new_balance,
+            source_hash=block_hash,
+        )
+        return await self._process_block(
+            block, f"receive of {amount_raw} raw from block {block_hash}"
+        )
+
     @reload_after
     @handle_errors
     async def receive_all(
@@ -456,14 +789,77 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         response = await self.list_receivables(threshold_raw=threshold_raw)
         receivables = response.unwrap()
 
+        if not receivables:
+            return []
+
+        # Fetch all send blocks with one bulk request
+        send_block_infos = await self._blocks_info(
+            [receivable.block_hash for receivable in receivables]
+        )
+
+        # Every receive builds on the previous one. The chain is tracked locally
+        # from a single account_info, so all blocks can be built up front.
+        params = await self._get_block_params()
+        previous, balance = params["previous"], params["balance"]
+        pending = []
         receivable: Receivable
         for receivable in receivables:
-            received_block = await self.receive_by_hash(
-                receivable.block_hash,
-                wait_confirmation=wait_confirmation,
-                timeout=timeout,
+            send_block_info = send_block_infos[receivable.block_hash]
+            amount_raw = int(send_block_info["amount"])
+            balance += amount_raw
+            block = self._new_block(
+                previous=previous,
+                representative=params["representative"],
+                balance=balance,
+                source_hash=receivable.block_hash,
+            )
+            previous = block.block_hash
+            pending.append((receivable.block_hash, block, amount_raw, send_block_info))
+
+        # One executor call signs the whole chain with a single key lookup
+        await asyncio.get_running_loop().run_in_executor(
+            None,
+            NanoWalletBlock.sign_all,
+            [block for _, block, _, _ in pending],
+            self.private_key,
+        )
+
+        # All work hashes are known now, so PoW is generated concurrently
+        works = await self._gather_bounded(
+            self._generate_work(block.work_block_hash) for _, block, _, _ in pending
+        )
+
+        # The node rejects a block whose previous block it has not seen yet,
+        # so the blocks are published in chain order
+        received = []
+        for (send_hash, block, amount_raw, send_block_info), work in zip(
+            pending, works
+        ):
+            block.set_work(work)
+            received_hash = await self._process_block(
+                block, f"receive of {amount_raw} raw from block {send_hash}"
+            )
+            logger.debug("Block processed with hash %s", received_hash)
+            received.append((received_hash, amount_raw, send_block_info))
+
+        # Confirmations do not depend on each other, so wait for them together
+        confirmations = [False] * len(received)
+        if wait_confirmation:
+            confirmations = await self._wait_for_confirmations(
+                [received_hash for received_hash, _, _ in received], timeout=timeout
+            )
+
+        for (received_hash, amount_raw, send_block_info), confirmed in zip(
+            received, confirmations
+        ):
+            block_results.append(
+                ReceivedBlock(
+                    block_hash=received_hash,
+                    amount_raw=amount_raw,
+                    source=send_block_info["block_account"],
+                    confirmed=confirmed,
+                )
             )
-            block_results.append(received_block.unwrap())
 
         return block_results
 
@@ -472,6 +868,10 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         """
         Sends remaining funds to the account opener.
 
+        The opener is the source of the account's open block. For an account
+        that is not opened yet, it is the sender of the largest receivable
+        block, since sweep receives that block first and it opens the account.
+
         :return: The hash of the sent block.
         :raises ValueError: If no funds are available or the refund account cannot be determined.
         """
@@ -483,9 +883,12 @@ class NanoWalletKey(NanoWalletReadOnly, NanoWalletKeyProtocol):
         if self._account_info.open_block:
             block_info = await self._block_info(self._account_info.open_block)
             refund_account = block_info["source_account"]
-        elif self.receivable_blocks:
-            first_receivable_hash = next(iter(self.receivable_blocks))
-            block_info = await self._block_info(first_receivable_hash)
+        elif self._receivable_amounts:
+            # The node lists receivables in no particular order. sweep receives
+            # the largest first, so that send block opens the account; reload
+            # already sorted them, so only its block is looked up
+            _, opening_hash = self._receivable_amounts[0]
+            block_info = await self._block_info(opening_hash)
             refund_account = block_info["block_account"]
         else:
             raise ValueError("Cannot determine refund account.")
@@ -1,4 +1,6 @@
 # nanowallet/wallets/read_only.py
+from itertools import islice, takewhile
+from operator import itemgetter
 from typing import Optional, List, Dict, Any, Protocol
 from ..libs.rpc import NanoRpcProtocol
 from ..models import WalletConfig, WalletBalance, AccountInfo, Receivable, Transaction
@@ -7,13 +9,13 @@ from ..utils.decorators import handle_errors, reload_after
 from ..errors import (
     try_raise_error,
     account_not_found,
-    no_error,
     InvalidAccountError,
 )
 from ..libs.account_helper import AccountHelper
 from .base import NanoWalletBase
 from ..utils import NanoResult
 import logging
+import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -42,7 +44,7 @@ class NanoWalletReadOnlyProtocol(Protocol):
         """Get detailed account information"""
 
     async def list_receivables(
-        self, threshold_raw: int = DEFAULT_THRESHOLD_RAW
+        self, threshold_raw: int = DEFAULT_THRESHOLD_RAW, limit: Optional[int] = None
     ) -> List[Receivable]:
         """List receivable blocks"""
 
@@ -132,7 +134,7 @@ class NanoWalletReadOnly(NanoWalletBase):
 
         :return: True if balance or receivable balance is greater than zero, False otherwise.
         """
-        await self.reload()
+        await self._reload_if_stale()
         return (self._balance_info.balance_raw > 0) or (
             self._balance_info.receivable_raw > 0
         )
@@ -161,32 +163,43 @@ class NanoWalletReadOnly(NanoWalletBase):
 
     @handle_errors
     async def list_receivables(
-        self, threshold_raw: int = DEFAULT_THRESHOLD_RAW
+        self, threshold_raw: int = DEFAULT_THRESHOLD_RAW, limit: Optional[int] = None
     ) -> List[Receivable]:
         """
         Lists receivable blocks sorted by descending amount.
 
         Args:
             threshold_raw: Minimum amount to consider (in raw).
+            limit: Maximum number of receivables to return, largest first.
 
         Returns:
             List of Receivable objects containing block hashes and amounts.
         """
-        await self.reload()
+        await self._reload_if_stale()
 
         # If receivable_blocks is empty, return an empty list
         if not self.receivable_blocks:
             return []
 
-        # Convert blocks to Receivable objects and filter by threshold
-        receivables = [
-            Receivable(block_hash=block, amount_raw=int(amount))
-            for block, amount in self.receivable_blocks.items()
-            if int(amount) >= threshold_raw
+        # Amounts were parsed and sorted by descending amount in reload, so
+        # the scan stops at the first amount below the threshold or the limit
+        return [
+            Receivable(block_hash=block, amount_raw=amount_raw)
+            for amount_raw, block in islice(
+                takewhile(
+                    lambda item: item[0] >= threshold_raw, self._receivable_amounts
+                ),
+                limit,
+            )
         ]
 
-        # Sort by descending amount
-        return sorted(receivables, key=lambda x: x.amount_raw, reverse=True)
+    async def _reload_if_stale(self) -> None:
+        """Reload unless the last reload is younger than config.reload_ttl"""
+        if (
+            self._reloaded_at is None
+            or time.monotonic() - self._reloaded_at > self.config.reload_ttl
+        ):
+            await self.reload()
 
     @handle_errors
     async def reload(self):
@@ -194,22 +207,42 @@ class NanoWalletReadOnly(NanoWalletBase):
         Reloads the wallet's account information and receivable blocks.
         """
         # pylint: disable=attribute-defined-outside-init
-        response = await self.rpc.receivable(self.account, threshold=1)
+        # An explicit reload must see changes made outside this wallet, so the
+        # cached account_info is dropped; the new response is cached again
+        self._invalidate_account()
+        # Both lookups are independent, so fetch them in a single batch
+        response, account_info = await self._batch(
+            [
+                {"action": "receivable", "account": self.account, "threshold": 1},
+                {"action": "account_info", **self._account_info_args()},
+            ]
+        )
         try_raise_error(response)
 
         self.receivable_blocks = response["blocks"] if "blocks" in response else {}
-        account_info = await self._fetch_account_info()
+        # Parse the amounts once and keep them sorted by descending amount.
+        # The node returns an empty string instead of {} without receivables.
+        self._receivable_amounts = (
+            sorted(
+                (
+                    (int(amount), block)
+                    for block, amount in self.receivable_blocks.items()
+                ),
+                key=itemgetter(0),
+                reverse=True,
+            )
+            if self.receivable_blocks
+            else []
+        )
 
         if account_not_found(account_info) and self.receivable_blocks:
             # New account with receivable blocks
             self._balance_info = WalletBalance(
                 balance_raw=0,
-                receivable_raw=sum(
-                    int(amount) for amount in self.receivable_blocks.values()
-                ),
+                receivable_raw=sum(amount for amount, _ in self._receivable_amounts),
             )
             self._account_info = AccountInfo(account=self.account)  # Empty account info
-        elif no_error(account_info):
+        elif "error" not in account_info:
             # Update balance info
             self._balance_info = WalletBalance(
                 balance_raw=int(account_info["balance"]),
@@ -227,6 +260,7 @@ class NanoWalletReadOnly(NanoWalletBase):
                 block_count=int(account_info["block_count"]),
                 weight_raw=int(account_info["weight"]),
             )
+        self._reloaded_at = time.monotonic()
 
     def to_string(self):
         return (
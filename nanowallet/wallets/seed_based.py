@@ -1,5 +1,6 @@
 # nanowallet/wallets/seed_based.py
 from typing import Optional
+import re
 from ..models import WalletConfig
 from ..libs.account_helper import AccountHelper
 from ..errors import InvalidSeedError, InvalidIndexError
@@ -9,6 +10,8 @@ from ..libs.rpc import NanoWalletRpc
 # Constants
 SEED_LENGTH = 64  # Length of hex seed
 MAX_INDEX = 4294967295  # Maximum index value (2^32 - 1)
+# Unlike int(seed, 16), rejects "0x" prefixes, underscores and whitespace
+_SEED_RE = re.compile(r"[0-9a-fA-F]{%d}" % SEED_LENGTH)
 
 
 class NanoWallet(NanoWalletKey):
@@ -32,11 +35,9 @@ class NanoWallet(NanoWalletKey):
         :raises InvalidIndexError: If index is invalid
         """
         # Validate seed
-        if not isinstance(seed, str) or len(seed) != 64:
+        if not isinstance(seed, str) or len(seed) != SEED_LENGTH:
             raise InvalidSeedError("Seed must be a 64 character hex string")
-        try:
-            int(seed, 16)
-        except ValueError:
+        if not _SEED_RE.fullmatch(seed):
             raise InvalidSeedError("Seed must be a valid hex string")
 
         # Validate index
@@ -10,7 +10,11 @@ setup(
     install_requires=[
         "nano_lib_py==0.5.1",
         "nanorpc==0.1.7",
+        "aiohttp>=3.8",
     ],
+    extras_require={
+        "fast": ["orjson"],
+    },
     python_requires=">=3.7",
     author="gr0vity",
     url="https://github.com/gr0vity-dev/nanowallet_py",
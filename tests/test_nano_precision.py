@@ -98,3 +98,14 @@ class TestNanoPrecision(unittest.TestCase):
         # Compare up to original precision
         self.assertEqual(str(result)[:35], original)
         self.assertEqual(str(result)[35:], "")
+
+    def test_conversion_independent_of_decimal_context(self):
+        # Results must not depend on the precision of the active Decimal context
+        from decimal import localcontext
+
+        amount = 2**128 - 1
+        expected = raw_to_nano(amount, decimal_places=30)
+        with localcontext() as ctx:
+            ctx.prec = 10
+            self.assertEqual(raw_to_nano(amount, decimal_places=30), expected)
+            self.assertEqual(nano_to_raw(expected), amount)
@@ -1,15 +1,42 @@
+import asyncio
+import socket
+import sqlite3
+import sys
+import threading
 import pytest
+import pytest_asyncio
 from unittest.mock import AsyncMock, patch, Mock
 
-
+from aiohttp import web
+from nano_lib_py.exceptions import InvalidAccount
 from nanowallet.wallets import NanoWallet, NanoWalletRpc
 from nanorpc.client import NanoRpcTyped
+from nanorpc.client_dynamic import MaxRetriesExceededError
 
 from nanowallet.utils.decorators import NanoResult, handle_errors, reload_after
-from nanowallet.errors import NanoException, InvalidAccountError, InvalidAmountError
+from nanowallet.errors import (
+    try_raise_error,
+    BlockNotFoundError,
+    NanoException,
+    InvalidAccountError,
+    InvalidAmountError,
+    InvalidSeedError,
+    RpcError,
+    TimeoutException,
+)
+from nanowallet.libs.account_helper import (
+    AccountHelper,
+    _cached_account_id,
+    _cached_public_key,
+    _cached_signing_key,
+)
+from nanowallet.libs.block import NanoWalletBlock, sign_hash, sign_hashes
+from nanowallet.libs.rpc_cache import SQLITE_MAX_VARIABLES, BlockInfoStore
+from nanowallet.libs.transport import PooledNanoRpc
 from decimal import Decimal
 from nanowallet.utils.conversion import raw_to_nano, nano_to_raw
 from nanowallet.utils.amount_operations import sum_received_amount
+from nanowallet.utils.validation import validate_nano_amount, _parse_nano_amount
 from nanowallet.models import *
 import logging
 
@@ -50,6 +77,25 @@ def mock_rpc(mock_rpc_typed):
     return rpc
 
 
+@pytest_asyncio.fixture
+async def local_server():
+    """Serve an aiohttp handler on a free local port, returns the port"""
+    runners = []
+
+    async def start(handler, method="POST"):
+        app = web.Application()
+        app.router.add_route(method, "/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        runners.append(runner)
+        return runner.addresses[0][1]
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+
+
 @pytest.mark.asyncio
 async def test_init(mock_rpc, seed, index, account, private_key):
 
@@ -218,6 +264,31 @@ async def test_reload_no_receivables(mock_rpc, mock_rpc_typed, seed, index):
     assert wallet._balance_info.receivable_raw == 1000000000000000000000000000000
 
 
+@pytest.mark.asyncio
+async def test_reload_with_client_without_batch(seed, index):
+
+    class MinimalRpc:
+        """Client implementing only the original NanoRpcProtocol methods"""
+
+        async def receivable(self, account, *, threshold=None, include_source=False):
+            return {"blocks": {"block1": "1000"}}
+
+        async def account_info(self, account, **kwargs):
+            assert kwargs["include_receivable"] == True
+            return {"error": "Account not found"}
+
+    wallet = NanoWallet(MinimalRpc(), seed, index)
+    await wallet.reload()
+
+    assert wallet.receivable_blocks == {"block1": "1000"}
+    assert wallet._balance_info.receivable_raw == 1000
+    # Clients without a cache have nothing to invalidate
+    wallet._invalidate_account()
+    # The fallback accepts the same actions as NanoWalletRpc.batch
+    with pytest.raises(ValueError, match="Unsupported batch action"):
+        await wallet._batch([{"action": "send", "account": wallet.account}])
+
+
 @pytest.mark.asyncio
 @patch("nanowallet.wallets.key_based.NanoWalletBlock")
 async def test_send_with_confirmation(
@@ -314,6 +385,41 @@ async def test_send_with_no_confirmation_timeout(
     mock_rpc_typed.process.assert_called()
 
 
+@pytest.mark.asyncio
+@patch("nanowallet.wallets.key_based.NanoWalletBlock")
+async def test_sweep_reads_account_once(
+    mock_block, mock_rpc_typed, mock_rpc, seed, index
+):
+
+    mock_rpc_typed.account_info.return_value = {
+        "frontier": "4c816abe42472ba8862d73139d0397ecb4cead4b21d9092281acda9ad8091b78",
+        "representative": "nano_3rropjiqfxpmrrkooej4qtmm1pueu36f9ghinpho4esfdor8785a455d16nf",
+        "balance": "2000000000000000000000000000000",
+        "representative_block": "representative_block",
+        "open_block": "open_block",
+        "confirmation_height": "1",
+        "block_count": "50",
+        "account_version": "1",
+        "weight": "3000000000000000000000000000000",
+        "receivable": "0",
+    }
+    mock_rpc_typed.receivable.return_value = {"blocks": ""}
+    mock_rpc_typed.work_generate.return_value = {"work": "work_value"}
+    mock_rpc_typed.process.return_value = {"hash": "processed_block_hash"}
+
+    wallet = NanoWallet(mock_rpc, seed, index)
+    result = await wallet.sweep(
+        "nano_3pay1r1z3fs5t3qix93oyt97np76qcp41afa7nzet9cem1ea334eoasot38s",
+        sweep_pending=False,
+        wait_confirmation=False,
+    )
+
+    assert result.value == "processed_block_hash"
+    assert mock_block.call_args.kwargs["balance"] == 0
+    # One read for the send block, one for the reload afterwards
+    assert mock_rpc_typed.account_info.call_count == 2
+
+
 @pytest.mark.asyncio
 @patch("nanowallet.wallets.key_based.NanoWalletBlock")
 async def test_send(mock_block, mock_rpc_typed, mock_rpc, seed, index):
@@ -468,6 +574,49 @@ async def test_list_receivables_threshold(mock_rpc, mock_rpc_typed, seed, index)
     assert result.value == expected
 
 
+@pytest.mark.asyncio
+async def test_list_receivables_limit(mock_rpc, mock_rpc_typed, seed, index):
+
+    mock_rpc_typed.receivable.return_value = {
+        "blocks": {
+            "block1": "1000000000000000000000000000000",
+            "block2": "3000000000000000000000000000000",
+            "block3": "2000000000000000000000000000000",
+        }
+    }
+
+    wallet = NanoWallet(mock_rpc, seed, index)
+    result = await wallet.list_receivables(limit=2)
+
+    assert result.success == True
+    assert [receivable.block_hash for receivable in result.value] == [
+        "block2",
+        "block3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_receivables_reuses_fresh_reload(
+    mock_rpc, mock_rpc_typed, seed, index
+):
+
+    mock_rpc_typed.receivable.return_value = {
+        "blocks": {"block1": "2000000000000000000000000000000"}
+    }
+
+    wallet = NanoWallet(mock_rpc, seed, index, config=WalletConfig(reload_ttl=60))
+    await wallet.list_receivables()
+    await wallet.has_balance()
+    await wallet.list_receivables()
+    assert mock_rpc_typed.receivable.call_count == 1
+
+    # Without a freshness window every call reloads
+    wallet = NanoWallet(mock_rpc, seed, index, config=WalletConfig(reload_ttl=0))
+    await wallet.list_receivables()
+    await wallet.has_balance()
+    assert mock_rpc_typed.receivable.call_count == 3
+
+
 @pytest.mark.asyncio
 @patch("nanowallet.wallets.key_based.NanoWalletBlock")
 async def test_receive_by_hash(mock_block, mock_rpc_typed, mock_rpc, seed, index):
@@ -815,9 +964,7 @@ def test_raw_to_nano():
     result = raw_to_nano(input_raw, decimal_places=30)
     print(result)
 
-    assert (
-        result == expected_nano
-    ), f"""Expected {
+    assert result == expected_nano, f"""Expected {
         expected_nano}, but got {result}"""
 
 
@@ -877,11 +1024,18 @@ async def test_receive_all(mock_rpc, mock_rpc_typed, seed, index):
 
     assert result.value[0].amount == Decimal("0.0005")
     assert result.value[1].amount == Decimal("2E-30")
-    assert mock_rpc_typed.receivable.call_count == 4
-    assert mock_rpc_typed.blocks_info.call_count == 2
-    assert mock_rpc_typed.account_info.call_count == 6
+    # No intermediate reload between the receives, the chain is tracked locally
+    assert mock_rpc_typed.receivable.call_count == 2
+    assert mock_rpc_typed.blocks_info.call_count == 1
+    assert mock_rpc_typed.account_info.call_count == 3
     assert mock_rpc_typed.work_generate.call_count == 2
     assert mock_rpc_typed.process.call_count == 2
+    # The second receive builds on the first one, which was signed locally
+    first_block = mock_rpc_typed.process.call_args_list[0].args[0]
+    second_block = mock_rpc_typed.process.call_args_list[1].args[0]
+    assert second_block["previous"] != first_block["previous"]
+    work_hash = mock_rpc_typed.work_generate.call_args_list[1].args[0]
+    assert work_hash.upper() == second_block["previous"].upper()
 
 
 @pytest.mark.asyncio
@@ -1020,6 +1174,54 @@ async def test_receive_all_mixed_confirmation(mock_rpc, mock_rpc_typed, seed, in
     assert mock_rpc_typed.process.call_count == 2
 
 
+@pytest.mark.asyncio
+async def test_wait_for_confirmations_polls_in_bulk(
+    mock_rpc, mock_rpc_typed, seed, index
+):
+    hashes = ["a" * 64, "b" * 64, "c" * 64]
+    polls = []
+
+    def blocks_info_side_effect(block_hashes, **kwargs):
+        polls.append(list(block_hashes))
+        # "c" confirms on the second round
+        return {
+            "blocks": {
+                block_hash: {
+                    "confirmed": (
+                        "true" if block_hash != "c" * 64 or len(polls) > 1 else "false"
+                    )
+                }
+                for block_hash in block_hashes
+            }
+        }
+
+    mock_rpc_typed.blocks_info.side_effect = blocks_info_side_effect
+    wallet = NanoWallet(mock_rpc, seed, index)
+
+    with patch("nanowallet.wallets.key_based.asyncio.sleep", AsyncMock()):
+        assert await wallet._wait_for_confirmations(hashes, timeout=5) == [True] * 3
+
+    # One request per round, later rounds only ask for unconfirmed blocks
+    assert polls == [hashes, ["c" * 64]]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_confirmation_bounds_hanging_rpc(
+    mock_rpc, mock_rpc_typed, seed, index
+):
+    async def hanging_blocks_info(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    mock_rpc_typed.blocks_info.side_effect = hanging_blocks_info
+    wallet = NanoWallet(mock_rpc, seed, index)
+
+    started = asyncio.get_running_loop().time()
+    assert await wallet._wait_for_confirmation("a" * 64, timeout=0.2) == False
+    with pytest.raises(TimeoutException):
+        await wallet._wait_for_confirmations(["a" * 64], timeout=0.2)
+    assert asyncio.get_running_loop().time() - started < 2
+
+
 @pytest.mark.asyncio
 async def test_receive_all_process_error(mock_rpc, mock_rpc_typed, seed, index, caplog):
     """Test receive_all handling of process errors"""
@@ -1251,6 +1453,29 @@ async def test_refund_first_sender_unopened(mock_rpc, mock_rpc_typed, seed, inde
     assert result.value == "processed_block_hash"
 
 
+@pytest.mark.asyncio
+async def test_refund_first_sender_picks_opening_receivable(
+    mock_rpc, mock_rpc_typed, seed, index
+):
+    mock_rpc_typed.account_info.return_value = {"error": "Account not found"}
+    mock_rpc_typed.receivable.return_value = {
+        "blocks": {"b" * 64: "1000", "a" * 64: "2000"}
+    }
+    mock_rpc_typed.blocks_info.return_value = {
+        "blocks": {"a" * 64: {"block_account": "opening_sender"}}
+    }
+
+    wallet = NanoWallet(mock_rpc, seed, index)
+    wallet.sweep = AsyncMock(return_value=NanoResult(value="refund_hash"))
+    result = await wallet.refund_first_sender()
+
+    assert result.value == "refund_hash"
+    wallet.sweep.assert_called_once_with("opening_sender")
+    # Only the largest receivable, which sweep receives first, is looked up
+    mock_rpc_typed.blocks_info.assert_called_once()
+    assert mock_rpc_typed.blocks_info.call_args.args[0] == ["a" * 64]
+
+
 @pytest.mark.asyncio
 async def test_refund_first_sender_no_account(mock_rpc, mock_rpc_typed, seed, index):
 
@@ -1443,6 +1668,36 @@ async def test_reload_after_decorator():
     assert test.reload_called == False  # Should reload even after exception
 
 
+@pytest.mark.asyncio
+async def test_reload_after_nested_reloads_once():
+    class TestClass:
+        def __init__(self):
+            self.reload_count = 0
+
+        async def reload(self):
+            self.reload_count += 1
+
+        @reload_after
+        async def inner(self):
+            return "inner"
+
+        @reload_after
+        async def outer(self, other=None):
+            await self.inner()
+            if other is not None:
+                await other.inner()
+            return "outer"
+
+    test, other = TestClass(), TestClass()
+    assert await test.outer(other) == "outer"
+    assert test.reload_count == 1
+    # Nested calls on another instance still reload that instance
+    assert other.reload_count == 1
+
+    await asyncio.gather(test.inner(), test.inner())
+    assert test.reload_count == 3
+
+
 @pytest.mark.asyncio
 async def test_combined_decorators():
     class TestClass:
@@ -1573,3 +1828,750 @@ async def test_account_history(mock_rpc, mock_rpc_typed):
     )
 
     assert blocks == expected_blocks
+
+
+@pytest.mark.asyncio
+async def test_rpc_batch(mock_rpc, mock_rpc_typed, account):
+
+    mock_rpc_typed.receivable.return_value = {"blocks": {"block1": "1000"}}
+    mock_rpc_typed.account_info.return_value = {"error": "Account not found"}
+
+    receivable, account_info = await mock_rpc.batch(
+        [
+            {"action": "receivable", "account": account, "threshold": 1},
+            {"action": "account_info", "account": account},
+        ]
+    )
+
+    assert receivable == {"blocks": {"block1": "1000"}}
+    assert account_info == {"error": "Account not found"}
+    mock_rpc_typed.receivable.assert_called_once_with(
+        account, threshold=1, source=False
+    )
+    assert mock_rpc_typed.account_info.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rpc_batch_unsupported_action(mock_rpc, mock_rpc_typed, account):
+
+    with pytest.raises(ValueError):
+        await mock_rpc.batch([{"action": "send", "account": account}])
+
+    assert mock_rpc_typed.send.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_rpc_blocks_info_cache(mock_rpc, mock_rpc_typed):
+
+    confirmed_hash = "a" * 64
+    unconfirmed_hash = "b" * 64
+
+    def blocks_info_side_effect(hashes, **kwargs):
+        responses = {
+            confirmed_hash: {"confirmed": "true", "subtype": "receive"},
+            unconfirmed_hash: {"confirmed": "false", "subtype": "receive"},
+        }
+        return {"blocks": {hash: responses[hash] for hash in hashes}}
+
+    mock_rpc_typed.blocks_info.side_effect = blocks_info_side_effect
+
+    await mock_rpc.blocks_info([confirmed_hash, unconfirmed_hash])
+    response = await mock_rpc.blocks_info([confirmed_hash, unconfirmed_hash])
+
+    # Only the unconfirmed block is fetched again
+    assert mock_rpc_typed.blocks_info.call_count == 2
+    mock_rpc_typed.blocks_info.assert_called_with(
+        [unconfirmed_hash], source=False, receive_hash=False, json_block=False
+    )
+    assert list(response["blocks"]) == [confirmed_hash, unconfirmed_hash]
+
+    response = await mock_rpc.blocks_info([confirmed_hash])
+    assert response == {
+        "blocks": {confirmed_hash: {"confirmed": "true", "subtype": "receive"}}
+    }
+    assert mock_rpc_typed.blocks_info.call_count == 2
+    assert mock_rpc.cache_info()["hits"] == 2
+
+    mock_rpc.cache_clear()
+    await mock_rpc.blocks_info([confirmed_hash])
+    assert mock_rpc_typed.blocks_info.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_rpc_blocks_info_persistent_store(mock_rpc_typed, tmp_path):
+
+    confirmed_hash = "a" * 64
+    block_info = {"confirmed": "true", "subtype": "receive"}
+    mock_rpc_typed.blocks_info.return_value = {"blocks": {confirmed_hash: block_info}}
+    cache_path = str(tmp_path / "blocks.sqlite")
+
+    async with NanoWalletRpc(url="mock://test", cache_path=cache_path) as rpc:
+        rpc._rpc = mock_rpc_typed
+        await rpc.blocks_info([confirmed_hash])
+
+    # A new client on the same store is served without a network request
+    async with NanoWalletRpc(url="mock://test", cache_path=cache_path) as rpc:
+        rpc._rpc = mock_rpc_typed
+        response = await rpc.blocks_info([confirmed_hash])
+
+    assert response == {"blocks": {confirmed_hash: block_info}}
+    assert mock_rpc_typed.blocks_info.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rpc_blocks_info_store_skips_head_block(mock_rpc_typed, tmp_path):
+
+    head_hash = "a" * 64
+    head_info = {"confirmed": "true", "subtype": "receive", "successor": "0" * 64}
+    cache_path = str(tmp_path / "blocks.sqlite")
+    # Written by an older version that persisted head-of-chain blocks
+    store = BlockInfoStore(cache_path)
+    store.set_many([(head_hash, head_info)], repr((False, False, False)))
+    store.close()
+
+    successor_info = {**head_info, "successor": "b" * 64}
+    mock_rpc_typed.blocks_info.return_value = {"blocks": {head_hash: successor_info}}
+    async with NanoWalletRpc(url="mock://test", cache_path=cache_path) as rpc:
+        rpc._rpc = mock_rpc_typed
+        response = await rpc.blocks_info([head_hash])
+
+    assert response == {"blocks": {head_hash: successor_info}}
+    assert mock_rpc_typed.blocks_info.call_count == 1
+
+
+def test_block_info_store_get_many_chunks():
+
+    store = BlockInfoStore(":memory:")
+    # Apply the limit of older SQLite builds
+    store._conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, SQLITE_MAX_VARIABLES)
+    hashes = [f"{i:064X}" for i in range(SQLITE_MAX_VARIABLES * 2)]
+    store.set_many([(block_hash, {"n": 1}) for block_hash in hashes], "flags")
+
+    assert len(store.get_many(hashes, "flags")) == len(hashes)
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_rpc_blocks_info_store_off_event_loop(mock_rpc_typed, tmp_path):
+
+    confirmed_hash = "a" * 64
+    mock_rpc_typed.blocks_info.return_value = {
+        "blocks": {confirmed_hash: {"confirmed": "true", "subtype": "receive"}}
+    }
+    threads = []
+    get_many, set_many = BlockInfoStore.get_many, BlockInfoStore.set_many
+
+    def record(method):
+        def wrapper(*args):
+            threads.append(threading.get_ident())
+            return method(*args)
+
+        return wrapper
+
+    with patch.object(BlockInfoStore, "get_many", record(get_many)), patch.object(
+        BlockInfoStore, "set_many", record(set_many)
+    ):
+        async with NanoWalletRpc(
+            url="mock://test", cache_path=str(tmp_path / "blocks.sqlite")
+        ) as rpc:
+            rpc._rpc = mock_rpc_typed
+            await rpc.blocks_info([confirmed_hash])
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_rpc_account_info_cache(mock_rpc_typed, account):
+
+    mock_rpc = NanoWalletRpc(url="mock://test", account_info_ttl=2)
+    mock_rpc._rpc = mock_rpc_typed
+    mock_rpc_typed.account_info.return_value = {"error": "Account not found"}
+
+    await mock_rpc.account_info(account)
+    await mock_rpc.account_info(account)
+    assert mock_rpc_typed.account_info.call_count == 1
+
+    # Different flags are not served from the cached response
+    await mock_rpc.account_info(account, include_weight=False)
+    assert mock_rpc_typed.account_info.call_count == 2
+
+    mock_rpc.invalidate_account(account)
+    await mock_rpc.account_info(account, include_weight=False)
+    assert mock_rpc_typed.account_info.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_reload_bypasses_account_info_cache(mock_rpc_typed, seed, index):
+
+    rpc = NanoWalletRpc(url="mock://test", account_info_ttl=2)
+    rpc._rpc = mock_rpc_typed
+    wallet = NanoWallet(rpc, seed, index)
+    mock_rpc_typed.receivable.return_value = {"blocks": ""}
+    mock_rpc_typed.account_info.return_value = {
+        "frontier": "frontier1",
+        "open_block": "open_block",
+        "representative_block": "representative_block",
+        "balance": "1",
+        "modified_timestamp": "1611868227",
+        "block_count": "1",
+        "account_version": "1",
+        "confirmation_height": "1",
+        "confirmation_height_frontier": "frontier1",
+        "representative": "nano_1stofnrxuz3cai7ze75o174bpm7scwj9jn3nxsn8ntzg784jf1gzn1jjdkou",
+        "receivable": "0",
+        "weight": "0",
+    }
+    await wallet.reload()
+
+    # The account changed outside this wallet, e.g. in a second process
+    mock_rpc_typed.account_info.return_value = {
+        **mock_rpc_typed.account_info.return_value,
+        "frontier": "frontier2",
+        "balance": "2",
+    }
+    account_info = (await wallet.account_info()).unwrap()
+
+    assert mock_rpc_typed.account_info.call_count >= 2
+    assert account_info.frontier_block == "frontier2"
+
+
+@pytest.mark.asyncio
+async def test_rpc_blocks_info_cache_unreceived_send(mock_rpc, mock_rpc_typed):
+
+    send_hash = "a" * 64
+    mock_rpc_typed.blocks_info.return_value = {
+        "blocks": {
+            send_hash: {
+                "confirmed": "true",
+                "subtype": "send",
+                "receive_hash": "0" * 64,
+            }
+        }
+    }
+
+    await mock_rpc.blocks_info([send_hash], include_receive_hash=True)
+    await mock_rpc.blocks_info([send_hash], include_receive_hash=True)
+
+    # The receive_hash of a pending send can still change
+    assert mock_rpc_typed.blocks_info.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rpc_blocks_info_cache_head_block(mock_rpc, mock_rpc_typed):
+
+    head_hash = "a" * 64
+    block_info = {"confirmed": "true", "subtype": "receive", "successor": "0" * 64}
+    mock_rpc_typed.blocks_info.return_value = {"blocks": {head_hash: block_info}}
+    await mock_rpc.blocks_info([head_hash])
+
+    # The account publishes its next block
+    successor = {**block_info, "successor": "b" * 64}
+    mock_rpc_typed.blocks_info.return_value = {"blocks": {head_hash: successor}}
+    response = await mock_rpc.blocks_info([head_hash])
+    assert response["blocks"][head_hash]["successor"] == "b" * 64
+
+    # Once it has a successor the block can no longer change
+    response = await mock_rpc.blocks_info([head_hash])
+    assert response["blocks"][head_hash]["successor"] == "b" * 64
+    assert mock_rpc_typed.blocks_info.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_blocks_info_bulk_fallback(mock_rpc, mock_rpc_typed, seed, index):
+
+    block_1 = "1" * 64
+    block_2 = "2" * 64
+
+    def blocks_info_side_effect(hashes, **kwargs):
+        if len(hashes) > 1:
+            return {"error": "Too many hashes"}
+        return {"blocks": {hashes[0]: {"amount": "1", "block_account": "source"}}}
+
+    mock_rpc_typed.blocks_info.side_effect = blocks_info_side_effect
+
+    wallet = NanoWallet(mock_rpc, seed, index)
+    blocks = await wallet._blocks_info([block_1, block_2])
+
+    assert list(blocks) == [block_1, block_2]
+    assert mock_rpc_typed.blocks_info.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_blocks_info_chunked(mock_rpc, mock_rpc_typed, seed, index):
+
+    hashes = [f"{i:064x}" for i in range(5)]
+
+    def blocks_info_side_effect(hashes, **kwargs):
+        return {"blocks": {hash: {"amount": "1"} for hash in hashes}}
+
+    mock_rpc_typed.blocks_info.side_effect = blocks_info_side_effect
+
+    wallet = NanoWallet(mock_rpc, seed, index)
+    with patch("nanowallet.wallets.base.BLOCKS_INFO_CHUNK_SIZE", 2):
+        blocks = await wallet._blocks_info(hashes)
+
+    assert list(blocks) == hashes
+    assert [len(c.args[0]) for c in mock_rpc_typed.blocks_info.call_args_list] == [
+        2,
+        2,
+        1,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rpc_reuses_connection(account, local_server):
+
+    peers = []
+
+    async def handler(request):
+        payload = await request.json()
+        assert payload["action"] == "account_info"
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"error": "Account not found"})
+
+    port = await local_server(handler)
+
+    async with NanoWalletRpc(url=f"http://127.0.0.1:{port}", account_info_ttl=0) as rpc:
+        await rpc.account_info(account)
+        await rpc.account_info(account)
+
+    assert len(peers) == 2
+    assert peers[0] == peers[1]
+
+
+@pytest.mark.asyncio
+async def test_rpc_connection_pool_limits():
+    rpc = NanoWalletRpc(
+        url="http://127.0.0.1:7076", connection_limit=100, keepalive_timeout=30
+    )
+    session = await rpc._transport._get_session()
+    assert session.connector.limit == 100
+    await rpc.close()
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_rpc_fails_over_to_next_endpoint(account, local_server):
+
+    # Reserve a port and release it so connections to it are refused
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead_port = sock.getsockname()[1]
+
+    async def handler(request):
+        return web.json_response({"error": "Account not found"})
+
+    port = await local_server(handler)
+
+    dead_url = f"http://127.0.0.1:{dead_port}"
+    live_url = f"http://127.0.0.1:{port}"
+    async with NanoWalletRpc(url=[dead_url, live_url], backoff=0) as rpc:
+        response = await rpc.account_info(account)
+        # The failed endpoint is in cooldown, so it is not tried again
+        response = await rpc.account_info(account)
+        endpoints = {e.url: e for e in rpc._transport.endpoints}
+
+    assert response == {"error": "Account not found"}
+    assert endpoints[dead_url].failures == 1
+    assert endpoints[live_url].failures == 0
+    assert endpoints[live_url].latency is not None
+
+
+@pytest.mark.asyncio
+async def test_rpc_does_not_resend_process_after_timeout(local_server):
+
+    requests = []
+
+    async def handler(request):
+        requests.append(await request.json())
+        # Accept the block but answer too late
+        await asyncio.sleep(0.5)
+        return web.json_response({"hash": "processed_block_hash"})
+
+    port = await local_server(handler)
+
+    rpc = PooledNanoRpc(url=f"http://127.0.0.1:{port}", backoff=0, request_timeout=0.1)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await rpc.process_payloads([{"action": "process", "block": {}}])
+        with pytest.raises(MaxRetriesExceededError):
+            await rpc.process_payloads([{"action": "block_count"}])
+    finally:
+        await rpc.close()
+
+    # The timed out publish is not resent, other requests are retried
+    actions = [payload["action"] for payload in requests]
+    assert actions == ["process", "block_count", "block_count", "block_count"]
+
+
+def test_rpc_closes_session_of_previous_event_loop():
+
+    rpc = PooledNanoRpc(url="http://127.0.0.1:7076")
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        first = first_loop.run_until_complete(rpc._get_session())
+        first_loop.close()
+        second = second_loop.run_until_complete(rpc._get_session())
+        assert first.closed
+        assert second is not first and not second.closed
+        second_loop.run_until_complete(rpc.close())
+    finally:
+        second_loop.close()
+
+
+def test_account_helper_cache(account, private_key):
+
+    AccountHelper.cache_clear()
+    public_key = AccountHelper.get_public_key(account)
+    assert AccountHelper.get_public_key(account) == public_key
+    assert _cached_public_key.cache_info().hits == 1
+
+    assert AccountHelper.get_account_address(private_key) == account
+    AccountHelper.cache_clear()
+    assert _cached_public_key.cache_info().currsize == 0
+
+
+def test_account_helper_cache_clear_drops_signing_keys(private_key):
+
+    AccountHelper.cache_clear()
+    sign_hash(private_key, "A" * 64)
+    assert _cached_signing_key.cache_info().currsize == 1
+
+    AccountHelper.cache_clear()
+    assert _cached_signing_key.cache_info().currsize == 0
+
+
+def test_transaction_link_as_account_cached(account):
+
+    AccountHelper.cache_clear()
+    public_key = AccountHelper.get_public_key(account)
+    transaction = Transaction(
+        block_hash="a" * 64,
+        type="state",
+        subtype="send",
+        account=account,
+        representative=account,
+        previous="b" * 64,
+        amount_raw=1,
+        balance_raw=0,
+        timestamp=0,
+        height=2,
+        confirmed=True,
+        link=public_key,
+        signature="",
+        work="",
+    )
+    assert transaction.link_as_account == account
+    assert transaction.destination == account
+    assert _cached_account_id.cache_info().hits == 1
+
+
+def test_validate_account_rejects_malformed_without_decoding(account):
+
+    assert AccountHelper.validate_account(account) == account
+    with patch("nanowallet.libs.account_helper._cached_public_key") as decode:
+        with pytest.raises(InvalidAccount):
+            AccountHelper.validate_account(account[:-1] + "0")
+        with pytest.raises(InvalidAccount):
+            AccountHelper.validate_account(account.replace("nano_", "ban_"))
+        decode.assert_not_called()
+
+
+def test_block_link_uses_cached_public_key(account):
+
+    AccountHelper.cache_clear()
+    link = NanoWalletBlock._get_link_value(None, account)
+    assert NanoWalletBlock._get_link_value(None, account) == link
+    assert _cached_public_key.cache_info().hits == 1
+    assert NanoWalletBlock._get_link_value(None, None) == "0" * 64
+
+
+def test_try_raise_error():
+
+    try_raise_error({"balance": "0"})
+    try_raise_error({"error": "Account not found"})
+
+    with pytest.raises(BlockNotFoundError):
+        try_raise_error({"error": "Block not found"})
+    with pytest.raises(RpcError) as exc_info:
+        try_raise_error({"error": "Fork detected"})
+    assert exc_info.value.message == "Fork detected"
+    with pytest.raises(RpcError) as exc_info:
+        try_raise_error({"error": ""})
+    assert exc_info.value.message == "Unknown error"
+
+
+def test_block_hash_cached(account):
+
+    block = NanoWalletBlock(
+        account=account,
+        previous="1" * 64,
+        representative=account,
+        balance=1,
+        destination_account=account,
+    )
+    block_hash = block.block_hash
+
+    with patch.object(block._block.__class__, "block_hash", new=None):
+        assert block.block_hash == block_hash
+    assert block.work_block_hash == "1" * 64
+
+
+@pytest.mark.parametrize("previous", ["0" * 64, "AB" * 32])
+def test_block_hash_matches_nano_lib(account, previous):
+
+    block = NanoWalletBlock(
+        account=account,
+        previous=previous,
+        representative=account,
+        balance=10**30 + 5,
+        source_hash="12" * 32,
+    )
+    assert block.block_hash == block._block.block_hash
+    assert block.work_block_hash == block._block.work_block_hash
+
+
+def test_block_sign_with_cached_key(account, private_key):
+
+    blocks = [
+        NanoWalletBlock(
+            account=account,
+            previous=previous * 64,
+            representative=account,
+            balance=1,
+            destination_account=account,
+        )
+        for previous in ("1", "2")
+    ]
+    for block in blocks:
+        block.sign(private_key)
+        assert block._block.has_valid_signature
+
+    signatures = sign_hashes(private_key, [block.block_hash for block in blocks])
+    assert [s.upper() for s in signatures] == [b._block.signature for b in blocks]
+
+    with pytest.raises(ValueError):
+        blocks[0].sign(private_key)
+
+    unsigned = [
+        NanoWalletBlock(
+            account=account,
+            previous=previous * 64,
+            representative=account,
+            balance=1,
+            destination_account=account,
+        )
+        for previous in ("1", "2")
+    ]
+    NanoWalletBlock.sign_all(unsigned, private_key)
+    assert [b._block.signature for b in unsigned] == [
+        b._block.signature for b in blocks
+    ]
+    with pytest.raises(ValueError):
+        NanoWalletBlock.sign_all(unsigned, private_key)
+
+
+def test_validate_nano_amount_cached():
+
+    _parse_nano_amount.cache_clear()
+    assert validate_nano_amount("1.5") == Decimal("1.5")
+    assert validate_nano_amount(Decimal("1.5")) == Decimal("1.5")
+    assert _parse_nano_amount.cache_info().hits == 1
+
+    for _ in range(2):
+        with pytest.raises(InvalidAmountError):
+            validate_nano_amount("-1")
+        with pytest.raises(InvalidAmountError):
+            validate_nano_amount(1.5)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10")
+def test_models_use_slots():
+
+    block = ReceivedBlock(block_hash="a" * 64, amount_raw=1, source="", confirmed=True)
+    assert not hasattr(block, "__dict__")
+    assert not hasattr(WalletBalance(), "__dict__")
+    assert not hasattr(WalletConfig(), "__dict__")
+
+
+@pytest.mark.asyncio
+async def test_generate_work_reuses_cached_work(mock_rpc, mock_rpc_typed, seed, index):
+    mock_rpc_typed.work_generate.return_value = {"work": "1234567890abcdef"}
+    wallet = NanoWallet(mock_rpc, seed, index)
+
+    assert await wallet._generate_work("a" * 64) == "1234567890abcdef"
+    assert await wallet._generate_work("a" * 64) == "1234567890abcdef"
+    assert mock_rpc_typed.work_generate.call_count == 1
+
+    # Work of a published block is dropped from the cache
+    mock_rpc_typed.process.return_value = {"hash": "processed_block_hash"}
+    await wallet._process_block(Mock(work_block_hash="a" * 64), "test")
+    await wallet._generate_work("a" * 64)
+    assert mock_rpc_typed.work_generate.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_precache_work_after_process(mock_rpc, mock_rpc_typed, seed, index):
+    mock_rpc_typed.work_generate.return_value = {"work": "1234567890abcdef"}
+    mock_rpc_typed.process.return_value = {"hash": "B" * 64}
+    wallet = NanoWallet(mock_rpc, seed, index, WalletConfig(precache_work=True))
+
+    await wallet._process_block(Mock(work_block_hash="a" * 64), "test")
+    # Work for the next block is requested in the background
+    assert await wallet._generate_work("B" * 64) == "1234567890abcdef"
+    mock_rpc_typed.work_generate.assert_called_once()
+    assert mock_rpc_typed.work_generate.call_args.args[0] == "B" * 64
+
+    # Failed work is not cached
+    mock_rpc_typed.work_generate.side_effect = [RpcError("boom"), {"work": "1"}]
+    with pytest.raises(RpcError):
+        await wallet._generate_work("c" * 64)
+    assert await wallet._generate_work("c" * 64) == "1"
+
+
+@pytest.mark.asyncio
+async def test_generate_work_locally(mock_rpc, mock_rpc_typed, seed, index):
+    mock_rpc_typed.work_generate.return_value = {"work": "1234567890abcdef"}
+    wallet = NanoWallet(mock_rpc, seed, index, WalletConfig(local_pow=True))
+
+    with patch(
+        "nanowallet.wallets.key_based.solve_work", return_value="fedcba0987654321"
+    ):
+        assert await wallet._generate_work("a" * 64) == "fedcba0987654321"
+    mock_rpc_typed.work_generate.assert_not_called()
+
+    # The RPC is used when local work cannot be solved in time
+    with patch("nanowallet.wallets.key_based.solve_work", return_value=None):
+        assert await wallet._generate_work("b" * 64) == "1234567890abcdef"
+    assert mock_rpc_typed.work_generate.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_confirmation_websocket(
+    mock_rpc, mock_rpc_typed, seed, index, local_server
+):
+
+    block_hash = "AB" * 32
+    subscriptions = []
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        subscriptions.append(await ws.receive_json())
+        await ws.send_json({"ack": "subscribe"})
+        await asyncio.sleep(0.05)
+        await ws.send_json(
+            {"topic": "confirmation", "message": {"hash": block_hash.lower()}}
+        )
+        async for _ in ws:
+            pass
+        return ws
+
+    port = await local_server(handler, method="GET")
+
+    mock_rpc_typed.blocks_info.return_value = {
+        "blocks": {block_hash: {"confirmed": "false"}}
+    }
+    wallet = NanoWallet(
+        mock_rpc, seed, index, WalletConfig(ws_url=f"ws://127.0.0.1:{port}")
+    )
+    assert await wallet._wait_for_confirmation(block_hash, timeout=5) == True
+
+    assert subscriptions[0]["topic"] == "confirmation"
+    assert subscriptions[0]["options"]["accounts"] == [wallet.account]
+    # Only the initial check polls, the confirmation itself is pushed
+    assert mock_rpc_typed.blocks_info.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_confirmation_websocket_falls_back_to_polling(
+    mock_rpc, mock_rpc_typed, seed, index
+):
+    block_hash = "AB" * 32
+    mock_rpc_typed.blocks_info.return_value = {
+        "blocks": {block_hash: {"confirmed": "true"}}
+    }
+    # Nothing listens on this port, so the websocket cannot connect
+    wallet = NanoWallet(mock_rpc, seed, index, WalletConfig(ws_url="ws://127.0.0.1:9"))
+    assert await wallet._wait_for_confirmation(block_hash, timeout=5) == True
+
+
+@pytest.mark.asyncio
+async def test_wait_for_confirmations_websocket_single_deadline(
+    mock_rpc, mock_rpc_typed, seed, index, local_server
+):
+
+    block_hashes = [f"{i:064X}" for i in range(4)]
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive_json()
+        await ws.send_json({"ack": "subscribe"})
+        # Never confirms anything
+        async for _ in ws:
+            pass
+        return ws
+
+    port = await local_server(handler, method="GET")
+
+    mock_rpc_typed.blocks_info.return_value = {
+        "blocks": {block_hash: {"confirmed": "false"} for block_hash in block_hashes}
+    }
+    config = WalletConfig(ws_url=f"ws://127.0.0.1:{port}", max_concurrency=1)
+    wallet = NanoWallet(mock_rpc, seed, index, config)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with pytest.raises(TimeoutException):
+        await wallet._wait_for_confirmations(block_hashes, timeout=0.3)
+
+    # All blocks share one deadline instead of waiting one after another
+    assert loop.time() - started < 0.3 * 2
+    assert mock_rpc_typed.blocks_info.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("behaviour", ["close", "garbage", "garbage_after_ack"])
+async def test_wait_for_confirmation_websocket_bad_server_falls_back(
+    mock_rpc, mock_rpc_typed, seed, index, behaviour, local_server
+):
+
+    block_hash = "AB" * 32
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive_json()
+        if behaviour == "garbage_after_ack":
+            await ws.send_json({"ack": "subscribe"})
+            await ws.send_str("[1, 2")
+            await ws.send_json({"topic": "confirmation", "message": {}})
+        elif behaviour == "garbage":
+            await ws.send_str("not json")
+        await ws.close()
+        return ws
+
+    port = await local_server(handler, method="GET")
+
+    # Unconfirmed on the first lookup, confirmed once polling takes over
+    mock_rpc_typed.blocks_info.side_effect = [
+        {"blocks": {block_hash: {"confirmed": "false"}}},
+        {"blocks": {block_hash: {"confirmed": "true"}}},
+    ]
+    wallet = NanoWallet(
+        mock_rpc, seed, index, WalletConfig(ws_url=f"ws://127.0.0.1:{port}")
+    )
+    assert await wallet._wait_for_confirmation(block_hash, timeout=5) == True
+
+    assert mock_rpc_typed.blocks_info.call_count == 2
+
+
+def test_invalid_seed_rejected(mock_rpc, seed, index):
+
+    for bad_seed in ("0x" + seed[2:], "_" + seed[1:], " " + seed[1:], "g" * 64):
+        with pytest.raises(InvalidSeedError, match="valid hex"):
+            NanoWallet(mock_rpc, bad_seed, index)
+    with pytest.raises(InvalidSeedError, match="64 character"):
+        NanoWallet(mock_rpc, seed[:-1], index)
+    assert NanoWallet(mock_rpc, seed.upper(), index).seed == seed